@@ -1,7 +1,8 @@
 import os
 from flask import Flask, request, send_from_directory
 from flask_migrate import Migrate
-from .extensions import db
+from sqlalchemy.engine import make_url
+from .extensions import db, READ_BIND_KEY
 from . import models  # Register models
 from .api import register_blueprints
 
@@ -24,6 +25,47 @@ def create_app():
         database_url = database_url.replace("postgres://", "postgresql://", 1)
     app.config["SQLALCHEMY_DATABASE_URI"] = database_url
     app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
+    url = make_url(database_url)
+    app.config["SQLALCHEMY_ENGINE_OPTIONS"] = {}
+    if url.get_backend_name() != "sqlite":
+        # Explicit pool sizing: each gunicorn worker thread can hold a connection,
+        # pre-ping drops connections the server closed while idle, and recycling
+        # keeps them under Postgres/Heroku idle timeouts. SQLite keeps the
+        # StaticPool Flask-SQLAlchemy picks for it, which rejects these options.
+        app.config["SQLALCHEMY_ENGINE_OPTIONS"].update(
+            pool_size=int(os.environ.get("DB_POOL_SIZE", "10")),
+            max_overflow=int(os.environ.get("DB_MAX_OVERFLOW", "20")),
+            pool_timeout=int(os.environ.get("DB_POOL_TIMEOUT", "30")),
+            pool_pre_ping=True,
+            pool_recycle=1800,
+        )
+    if url.get_driver_name() == "psycopg2":
+        # ORM INSERTs already batch through insertmanyvalues; values_plus_batch
+        # also pages executemany UPDATE/DELETE statements via execute_batch.
+        app.config["SQLALCHEMY_ENGINE_OPTIONS"].update(
+            executemany_mode="values_plus_batch",
+            executemany_batch_page_size=500,
+        )
+    
+    # Optional read-only engine for the matrix/export reports (see read_session).
+    # Bind options do not inherit SQLALCHEMY_ENGINE_OPTIONS, so its pool is set
+    # up here in full and can be sized independently of the write pool.
+    database_read_url = os.environ.get("DATABASE_READ_URL")
+    if database_read_url:
+        if database_read_url.startswith("postgres://"):
+            database_read_url = database_read_url.replace("postgres://", "postgresql://", 1)
+        app.config["SQLALCHEMY_BINDS"] = {
+            READ_BIND_KEY: {
+                "url": database_read_url,
+                "pool_size": int(os.environ.get("DB_READ_POOL_SIZE", "20")),
+                "max_overflow": int(os.environ.get("DB_READ_MAX_OVERFLOW", "40")),
+                "pool_timeout": int(os.environ.get("DB_POOL_TIMEOUT", "30")),
+                "pool_pre_ping": True,
+                "pool_recycle": 1800,
+                # Also safe when pointed at the primary: writes are refused.
+                "connect_args": {"options": "-c default_transaction_read_only=on"},
+            },
+        }
     
     # Initialize extensions
     db.init_app(app)
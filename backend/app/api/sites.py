@@ -11,12 +11,14 @@ import csv
 import calendar
 from io import BytesIO, StringIO
 import unicodedata
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
 from copy import copy
 from openpyxl import load_workbook
 from openpyxl.utils import get_column_letter
 from sqlalchemy import and_, or_, func, case
-from sqlalchemy.orm import joinedload
+from sqlalchemy.orm import joinedload, raiseload
 from twilio.rest import Client
 from ..repositories.site_repository import SiteRepository
 from ..repositories.employee_repository import EmployeeRepository
@@ -33,7 +35,7 @@ from ..auth_utils import token_required, role_required
 from ..utils import normalize_phone
 from ..models.work_cards import WorkCard, WorkCardExtraction, WorkCardDayEntry
 from ..models.sites import Employee
-from ..extensions import db
+from ..extensions import db, read_session
 from ..observability import QueryCounter, sites_metrics
 from ..services.email_service import send_email_with_attachment
 from ..services.whatsapp_listener_client import (
@@ -71,9 +73,12 @@ STATUS_DAY_LABELS = {
 }
 
 EMAIL_REGEX = re.compile(r'^[a-zA-Z0-9._%+\-]+@[a-zA-Z0-9.\-]+\.[a-zA-Z]{2,}$')
+SALARY_DAY_HEADER_REGEX = re.compile(r'^\s*(\d{1,2})\.(\d{1,2})\s*$')
 
 IL_COUNTRY_CODE = '972'
 
+WHATSAPP_BATCH_MAX_WORKERS = 8
+
 
 def _normalize_contractor_phone(raw):
     """Normalize a contractor phone input to E.164 digits (no leading +).
@@ -138,6 +143,13 @@ def _generate_access_token():
             break
     return token
 
+@lru_cache(maxsize=4)
+def _twilio_client(account_sid: str, auth_token: str):
+    """Return a shared Twilio client so its HTTP session (and the TLS
+    connection to Twilio) is reused across requests. Keyed by credentials,
+    so rotated env values get a fresh client."""
+    return Client(account_sid, auth_token)
+
 def _format_whatsapp_number(raw_phone: str):
     if not raw_phone:
         return None
@@ -202,12 +214,19 @@ def _resolve_summary_template_path() -> Path:
 
 def _resolve_salary_template_path(month_date) -> Path:
     """Resolve salary export template for a month from employee_sheet_extraction."""
+    return _salary_template_path_for(month_date.year, month_date.month)
+
+
+@lru_cache(maxsize=64)
+def _salary_template_path_for(year: int, month: int) -> Path:
+    # Templates only change on deploy, so the directory scan is done once per
+    # month per process. Lookups that raise are not cached.
     root_dir = Path(__file__).resolve().parents[3]
     templates_dir = root_dir / 'employee_sheet_extraction'
     if not templates_dir.exists():
         raise FileNotFoundError('Template folder employee_sheet_extraction was not found')
 
-    month_token = f"{month_date.month:02d}_{month_date.year}"
+    month_token = f"{month:02d}_{year}"
     month_candidates = []
     generic_candidates = []
 
@@ -216,7 +235,7 @@ def _resolve_salary_template_path(month_date) -> Path:
         if 'worker_new_hours_template' not in stem:
             continue
         generic_candidates.append(candidate)
-        if month_token in stem or f"{month_date.month}_{month_date.year}" in stem:
+        if month_token in stem or f"{month}_{year}" in stem:
             month_candidates.append(candidate)
 
     if month_candidates:
@@ -225,7 +244,7 @@ def _resolve_salary_template_path(month_date) -> Path:
         return generic_candidates[-1]
 
     raise FileNotFoundError(
-        f'No salary template found in {templates_dir} for {month_date.strftime("%Y-%m")}'
+        f'No salary template found in {templates_dir} for {year:04d}-{month:02d}'
     )
 
 
@@ -236,13 +255,12 @@ def _extract_salary_day_columns_map(ws, month_date):
     """
     day_columns = {}
     observed_months = set()
-    pattern = re.compile(r'^\s*(\d{1,2})\.(\d{1,2})\s*$')
 
     for col in range(2, ws.max_column + 1):
         value = ws.cell(row=1, column=col).value
         if value is None:
             continue
-        match = pattern.match(str(value))
+        match = SALARY_DAY_HEADER_REGEX.match(str(value))
         if not match:
             continue
         day = int(match.group(1))
@@ -309,8 +327,8 @@ def _ensure_salary_template_month_columns(ws, month_date):
 
 def _find_salary_instruction_row(ws):
     """Find first row that starts the instructions block (contains 'הוראות' in column A)."""
-    for row in range(2, ws.max_row + 1):
-        cell_value = ws.cell(row=row, column=1).value
+    column_a = ws.iter_rows(min_row=2, min_col=1, max_col=1, values_only=True)
+    for row, (cell_value,) in enumerate(column_a, start=2):
         if cell_value is None:
             continue
         if 'הוראות' in str(cell_value):
@@ -362,33 +380,33 @@ def _populate_salary_template_sheet(ws, employees, matrix, month_date, status_ma
             _copy_salary_row_template(ws, base_template_row, row)
         instruction_row += rows_to_insert
 
+    # Blank-day fallback per column, computed once rather than per cell.
+    day_fallbacks = [
+        (day, col, 'שבת' if day <= days_in_month and datetime(month_date.year, month_date.month, day).weekday() == 5 else None)
+        for day, col in day_columns.items()
+    ]
+
     def clear_row(row_index):
         ws.cell(row=row_index, column=1, value=None)
-        for day, col in day_columns.items():
-            cell = ws.cell(row=row_index, column=col)
-            is_saturday = day <= days_in_month and datetime(month_date.year, month_date.month, day).weekday() == 5
-            cell.value = 'שבת' if is_saturday else None
+        for _, col, fallback in day_fallbacks:
+            ws.cell(row=row_index, column=col).value = fallback
 
     for idx, employee in enumerate(employees):
         row_index = employee_start_row + idx
         employee_id_value = (employee.passport_id or '').strip() if employee.passport_id else ''
-        ws.cell(row=row_index, column=1, value=employee_id_value)
+        ws.cell(row=row_index, column=1).value = employee_id_value
 
         employee_id_str = str(employee.id)
         employee_days = matrix.get(employee_id_str, {})
         employee_statuses = status_matrix.get(employee_id_str, {})
-        for day, col in day_columns.items():
-            cell = ws.cell(row=row_index, column=col)
+        for day, col, fallback in day_fallbacks:
             status = employee_statuses.get(day)
             if status:
-                cell.value = STATUS_DAY_LABELS[status]
+                value = STATUS_DAY_LABELS[status]
             else:
                 hours = employee_days.get(day)
-                if hours is None:
-                    is_saturday = day <= days_in_month and datetime(month_date.year, month_date.month, day).weekday() == 5
-                    cell.value = 'שבת' if is_saturday else None
-                else:
-                    cell.value = round(float(hours), 2)
+                value = fallback if hours is None else round(float(hours), 2)
+            ws.cell(row=row_index, column=col).value = value
 
     for row_index in range(employee_start_row + needed_rows, instruction_row):
         clear_row(row_index)
@@ -462,6 +480,12 @@ def _populate_template_core_sheet(
         first_name = (employee.full_name or '').split()[0] if employee.full_name else ''
         ws.cell(row=2, column=idx, value=first_name)._style = copy(style_body)
 
+    # Per-employee lookups are resolved once, not once per day cell.
+    employee_columns = [
+        (idx, matrix.get(str(employee.id), {}), status_matrix.get(str(employee.id), {}))
+        for idx, employee in enumerate(employees, start=2)
+    ]
+
     # Body rows: one row per actual day in the month (rows 3..days_in_month+2)
     for day in range(1, days_in_month + 1):
         row = day + 2
@@ -470,17 +494,16 @@ def _populate_template_core_sheet(
             column=1,
             value=_format_day_label(month_date.year, month_date.month, day, days_in_month)
         )._style = copy(style_body)
+        fallback = _day_fallback_value(month_date.year, month_date.month, day, days_in_month)
 
-        for idx, employee in enumerate(employees, start=2):
-            employee_id_str = str(employee.id)
-            status = status_matrix.get(employee_id_str, {}).get(day)
+        for idx, employee_days, employee_statuses in employee_columns:
+            status = employee_statuses.get(day)
             if status:
                 value = STATUS_DAY_LABELS[status]
             else:
-                employee_days = matrix.get(employee_id_str, {})
                 value = employee_days.get(day)
                 if value is None:
-                    value = _day_fallback_value(month_date.year, month_date.month, day, days_in_month)
+                    value = fallback
             ws.cell(row=row, column=idx, value=value)._style = copy(style_body)
 
     # Clear template styling for any excess rows (e.g. days 29-31 when month has 28 days)
@@ -587,19 +610,26 @@ def _add_tariff_summary(ws, employee_count, hourly_tariff, style_body,
 def _load_hours_matrix(site_id, processing_month, approved_only, include_inactive):
     started_at = time.perf_counter()
     month = datetime.strptime(processing_month, '%Y-%m-%d').date()
-    site_results = load_hours_matrix_for_sites(
-        site_ids=[site_id],
-        processing_month=processing_month,
-        approved_only=approved_only,
-        include_inactive=include_inactive,
-        business_id=g.business_id,
-    )
+    with read_session() as session:
+        site_results = load_hours_matrix_for_sites(
+            site_ids=[site_id],
+            processing_month=processing_month,
+            approved_only=approved_only,
+            include_inactive=include_inactive,
+            business_id=g.business_id,
+            session=session,
+        )
     site_data = site_results.get(site_id, {'employees': [], 'matrix': {}, 'status_map': {}, 'status_matrix': {}, 'monthly_totals': {}})
     return site_data['employees'], site_data['matrix'], site_data['status_map'], month, site_data['status_matrix'], site_data['monthly_totals']
 
 
-def load_hours_matrix_for_sites(site_ids, processing_month, approved_only, include_inactive, business_id):
-    """Bulk load employees + best-card hours matrix for multiple sites in a fixed query budget."""
+def load_hours_matrix_for_sites(site_ids, processing_month, approved_only, include_inactive, business_id, session=None):
+    """Bulk load employees + best-card hours matrix for multiple sites in a fixed query budget.
+
+    session defaults to db.session; callers pass read_session() to use the read bind.
+    """
+    if session is None:
+        session = db.session
     month = datetime.strptime(processing_month, '%Y-%m-%d').date()
     unique_site_ids = list(dict.fromkeys(site_ids or []))
     if not unique_site_ids:
@@ -613,10 +643,12 @@ def load_hours_matrix_for_sites(site_ids, processing_month, approved_only, inclu
 
     # Baseline columns: employees whose home site is one of the target sites.
     # They appear as a column even with zero hours (preserves prior behavior).
-    employee_query = db.session.query(Employee).filter(
+    # raiseload: matrix and exports only read Employee columns, so any lazy
+    # load off these rows would be an N+1 regression and should fail loudly.
+    employee_query = session.query(Employee).filter(
         Employee.business_id == business_id,
         Employee.site_id.in_(unique_site_ids),
-    )
+    ).options(raiseload('*'))
     if not include_inactive:
         employee_query = employee_query.filter(Employee.is_active.is_(True))
     home_employees = employee_query.all()
@@ -626,7 +658,7 @@ def load_hours_matrix_for_sites(site_ids, processing_month, approved_only, inclu
     # must surface here even though no card of theirs belongs to this site.
     visiting_employee_ids = {
         row[0]
-        for row in db.session.query(WorkCard.employee_id)
+        for row in session.query(WorkCard.employee_id)
         .join(WorkCardDayEntry, WorkCardDayEntry.work_card_id == WorkCard.id)
         .filter(
             WorkCard.business_id == business_id,
@@ -640,10 +672,10 @@ def load_hours_matrix_for_sites(site_ids, processing_month, approved_only, inclu
     employees_by_id = {emp.id: emp for emp in home_employees}
     missing_ids = [eid for eid in visiting_employee_ids if eid not in employees_by_id]
     if missing_ids:
-        visiting_query = db.session.query(Employee).filter(
+        visiting_query = session.query(Employee).filter(
             Employee.business_id == business_id,
             Employee.id.in_(missing_ids),
-        )
+        ).options(raiseload('*'))
         if not include_inactive:
             visiting_query = visiting_query.filter(Employee.is_active.is_(True))
         for emp in visiting_query.all():
@@ -667,7 +699,7 @@ def load_hours_matrix_for_sites(site_ids, processing_month, approved_only, inclu
     # Best (managing) card per relevant employee for the month, ranked across ALL
     # their cards regardless of site: a transferred employee's card lives at their
     # final/home site yet contributes days to the sites they moved through.
-    ranked_cards = db.session.query(
+    ranked_cards = session.query(
         WorkCard.id.label('work_card_id'),
         WorkCard.site_id,
         WorkCard.employee_id,
@@ -694,7 +726,7 @@ def load_hours_matrix_for_sites(site_ids, processing_month, approved_only, inclu
 
     ranked_cards = ranked_cards.subquery()
 
-    best_cards_rows = db.session.query(
+    best_cards_rows = session.query(
         ranked_cards.c.work_card_id,
         ranked_cards.c.site_id,
         ranked_cards.c.employee_id,
@@ -718,7 +750,7 @@ def load_hours_matrix_for_sites(site_ids, processing_month, approved_only, inclu
         if row.site_id in target_site_ids:
             site_results[row.site_id]['status_map'][str(row.employee_id)] = row.review_status
 
-    day_entries = db.session.query(
+    day_entries = session.query(
         WorkCardDayEntry.work_card_id,
         WorkCardDayEntry.day_of_month,
         WorkCardDayEntry.total_hours,
@@ -1421,13 +1453,15 @@ def export_monthly_summary_batch():
         for ws in workbook.worksheets[1:]:
             workbook.remove(ws)
 
-        site_matrices = load_hours_matrix_for_sites(
-            site_ids=[site.id for site in sites],
-            processing_month=processing_month,
-            approved_only=approved_only,
-            include_inactive=include_inactive,
-            business_id=g.business_id,
-        )
+        with read_session() as session:
+            site_matrices = load_hours_matrix_for_sites(
+                site_ids=[site.id for site in sites],
+                processing_month=processing_month,
+                approved_only=approved_only,
+                include_inactive=include_inactive,
+                business_id=g.business_id,
+                session=session,
+            )
 
         used_sheet_names = set()
         for site in sites:
@@ -1592,13 +1626,15 @@ def export_salary_template_batch():
         for ws in workbook.worksheets[1:]:
             workbook.remove(ws)
 
-        site_matrices = load_hours_matrix_for_sites(
-            site_ids=[site.id for site in sites],
-            processing_month=processing_month,
-            approved_only=False,
-            include_inactive=include_inactive,
-            business_id=g.business_id,
-        )
+        with read_session() as session:
+            site_matrices = load_hours_matrix_for_sites(
+                site_ids=[site.id for site in sites],
+                processing_month=processing_month,
+                approved_only=False,
+                include_inactive=include_inactive,
+                business_id=g.business_id,
+                session=session,
+            )
 
         used_sheet_names = set()
         populated_count = 0
@@ -1755,7 +1791,7 @@ def send_whatsapp_link(site_id, request_id):
             logger.error("Twilio credentials missing")
             return api_response(status_code=500, message="Server configuration error", error="Twilio config missing")
 
-        client = Client(account_sid, auth_token)
+        client = _twilio_client(account_sid, auth_token)
 
         url = _build_access_link_url(access_request.token)
         message_body = (
@@ -1804,12 +1840,14 @@ def send_whatsapp_links_batch():
         logger.error("Twilio credentials missing")
         return api_response(status_code=500, message="Server configuration error", error="Twilio config missing")
 
-    client = Client(account_sid, auth_token)
+    client = _twilio_client(account_sid, auth_token)
 
     results = []
     sent_count = 0
     failed_count = 0
     skipped_count = 0
+    new_access_requests = []
+    pending_sends = []
 
     parsed_site_ids = []
     for site_id in site_ids:
@@ -1946,18 +1984,18 @@ def send_whatsapp_links_batch():
             })
             continue
 
-        expires_at = datetime.now(timezone.utc) + timedelta(days=30)
-
-        access_request = access_repo.create(
-            token=token,
-            business_id=g.business_id,
-            site_id=site.id,
-            employee_id=employee.id,
-            processing_month=month,
-            created_by_user_id=g.current_user.id,
-            expires_at=expires_at,
-            is_active=True
-        )
+        access_request_id = uuid.uuid4()
+        new_access_requests.append({
+            'id': access_request_id,
+            'token': token,
+            'business_id': g.business_id,
+            'site_id': site.id,
+            'employee_id': employee.id,
+            'processing_month': month,
+            'created_by_user_id': g.current_user.id,
+            'expires_at': datetime.now(timezone.utc) + timedelta(days=30),
+            'is_active': True,
+        })
 
         url = _build_access_link_url(token)
         message_body = (
@@ -1966,36 +2004,44 @@ def send_whatsapp_links_batch():
             f"{url}"
         )
 
-        try:
-            message = client.messages.create(
-                from_=from_number,
-                body=message_body,
-                to=f"whatsapp:{formatted_phone}"
-            )
-            logger.info(f"WhatsApp sent to {formatted_phone}: {message.sid}")
-            sent_count += 1
-            sites_metrics.increment_whatsapp_batch_outcome('sent')
-            results.append({
-                'site_id': site_id_str,
-                'site_name': site.site_name,
-                'employee_id': str(employee.id),
-                'employee_name': employee.full_name,
-                'request_id': str(access_request.id),
-                'status': 'sent'
-            })
-        except Exception as e:
-            logger.exception(f"Twilio error for site {site.id}")
-            failed_count += 1
-            sites_metrics.increment_whatsapp_batch_outcome('failed')
-            results.append({
-                'site_id': site_id_str,
-                'site_name': site.site_name,
-                'employee_id': str(employee.id),
-                'employee_name': employee.full_name,
-                'request_id': str(access_request.id),
-                'status': 'failed',
-                'reason': str(e)
-            })
+        # Status is filled in once the send completes; appending now keeps
+        # results in request order.
+        result = {
+            'site_id': site_id_str,
+            'site_name': site.site_name,
+            'employee_id': str(employee.id),
+            'employee_name': employee.full_name,
+            'request_id': str(access_request_id),
+        }
+        results.append(result)
+        pending_sends.append((result, f"whatsapp:{formatted_phone}", message_body))
+
+    if new_access_requests:
+        access_repo.create_many(new_access_requests)
+
+    # Twilio calls are network-bound, so send concurrently. Worker threads only
+    # touch the Twilio client; no session or app context is shared with them.
+    if pending_sends:
+        max_workers = min(WHATSAPP_BATCH_MAX_WORKERS, len(pending_sends))
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = [
+                executor.submit(client.messages.create, from_=from_number, body=body, to=to)
+                for _, to, body in pending_sends
+            ]
+
+        for (result, to, _), future in zip(pending_sends, futures):
+            try:
+                message = future.result()
+                logger.info(f"WhatsApp sent to {to}: {message.sid}")
+                sent_count += 1
+                sites_metrics.increment_whatsapp_batch_outcome('sent')
+                result['status'] = 'sent'
+            except Exception as e:
+                logger.exception(f"Twilio error for site {result['site_id']}")
+                failed_count += 1
+                sites_metrics.increment_whatsapp_batch_outcome('failed')
+                result['status'] = 'failed'
+                result['reason'] = str(e)
 
     return api_response(data={
         'total_requested': len(site_ids),
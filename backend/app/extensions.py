@@ -1,3 +1,25 @@
+from contextlib import contextmanager
+
 from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy.orm import Session
 
 db = SQLAlchemy()
+
+# Bind key of the optional read-only engine configured from DATABASE_READ_URL.
+READ_BIND_KEY = 'read'
+
+
+@contextmanager
+def read_session():
+    """Session for bulk read-only report queries.
+
+    Uses the read bind when DATABASE_READ_URL is configured, so report reads
+    run on their own pool (or replica); otherwise yields db.session unchanged.
+    Objects loaded through the read bind are detached when the block exits.
+    """
+    engine = db.engines.get(READ_BIND_KEY)
+    if engine is None:
+        yield db.session
+        return
+    with Session(engine) as session:
+        yield session
@@ -19,7 +19,6 @@ class ExportRun(db.Model):
     created_at = db.Column(db.DateTime(timezone=True), default=utc_now)
 
     __table_args__ = (
-        Index('ix_export_runs_business_id', 'business_id'),
         Index('ix_export_runs_business_month_site', 'business_id', 'processing_month', 'site_id'),
     )
 
@@ -40,7 +39,6 @@ class AuditEvent(db.Model):
     created_at = db.Column(db.DateTime(timezone=True), default=utc_now)
 
     __table_args__ = (
-        Index('ix_audit_events_business_id', 'business_id'),
         Index('ix_audit_events_entity', 'entity_type', 'entity_id'),
         Index('ix_audit_events_business_site_time', 'business_id', 'site_id', 'created_at'),
     )
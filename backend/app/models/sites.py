@@ -33,7 +33,6 @@ class Site(db.Model):
     updated_at = db.Column(db.DateTime(timezone=True), default=utc_now, onupdate=utc_now)
 
     __table_args__ = (
-        Index('ix_sites_business_id', 'business_id'),
         Index('ix_sites_responsible_employee_id', 'responsible_employee_id'),
         Index('ix_sites_field_manager_id', 'field_manager_id'),
         db.UniqueConstraint('business_id', 'site_name', name='uq_sites_business_name'),
@@ -67,4 +66,5 @@ class Employee(db.Model):
         Index('ix_employees_business_id', 'business_id'),
         Index('ix_employees_site_id', 'site_id'),
         Index('ix_employees_business_passport', 'business_id', 'passport_id', unique=True, postgresql_where='passport_id IS NOT NULL'),
+        Index('ix_employees_business_external_id', 'business_id', 'external_employee_id', postgresql_where='external_employee_id IS NOT NULL'),
     )
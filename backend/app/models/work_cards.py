@@ -40,10 +40,13 @@ class WorkCard(db.Model):
     day_entries = db.relationship('WorkCardDayEntry', backref='work_card', cascade="all, delete-orphan")
 
     __table_args__ = (
-        Index('ix_work_cards_business_id', 'business_id'),
         Index('ix_work_cards_business_site_month', 'business_id', 'site_id', 'processing_month'),
         Index('ix_work_cards_employee_month', 'employee_id', 'processing_month'),
         Index('ix_work_cards_review_status', 'review_status'),
+        Index(
+            'ix_work_cards_matrix_cover', 'business_id', 'processing_month', 'employee_id',
+            postgresql_include=['id', 'site_id', 'review_status', 'monthly_total_hours', 'created_at'],
+        ),
     )
 
 class WorkCardFile(db.Model):
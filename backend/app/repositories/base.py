@@ -1,7 +1,8 @@
-from typing import TypeVar, Generic, Type, Optional, List, Dict, Any
+from typing import TypeVar, Generic, Type, Optional, List, Dict, Any, Sequence, Tuple
 from uuid import UUID
 from sqlalchemy import inspect
-from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.exc import NoResultFound, SQLAlchemyError
 from ..extensions import db
 
 T = TypeVar('T')
@@ -15,7 +16,11 @@ class BaseRepository(Generic[T]):
     
     def __init__(self, model_class: Type[T]):
         self.model_class = model_class
-        self.session = db.session
+
+    @property
+    def session(self):
+        # Looked up per call so a swapped db.session (e.g. in tests) is honoured.
+        return db.session
     
     def create(self, **kwargs) -> T:
         """
@@ -39,6 +44,58 @@ class BaseRepository(Generic[T]):
             self.session.rollback()
             raise e
     
+    def get_or_create(
+        self,
+        defaults: Optional[Dict[str, Any]] = None,
+        conflict_target: Optional[Sequence[str]] = None,
+        **lookup,
+    ) -> Tuple[T, bool]:
+        """
+        Get the instance matching ``lookup``, creating it if it doesn't exist.
+
+        Uses a single INSERT ... ON CONFLICT DO NOTHING RETURNING, so the
+        create path is one round-trip and concurrent callers can't both
+        insert. Only a conflict on ``conflict_target`` is ignored; a clash with
+        any other unique constraint still raises IntegrityError.
+
+        Args:
+            defaults: Extra fields to set only when creating
+            conflict_target: Columns of the unique constraint to treat as
+                "already exists" (defaults to the ``lookup`` keys)
+            **lookup: Fields identifying the instance
+
+        Returns:
+            Tuple of (instance, created)
+
+        Raises:
+            SQLAlchemyError: If database operation fails
+            ValueError: If the existing row for ``conflict_target`` doesn't
+                match ``lookup``
+        """
+        index_elements = list(conflict_target or lookup)
+        try:
+            stmt = (
+                pg_insert(self.model_class)
+                .values(**lookup, **(defaults or {}))
+                .on_conflict_do_nothing(index_elements=index_elements)
+                .returning(self.model_class)
+            )
+            instance = self.session.scalars(stmt).first()
+            self.session.commit()
+        except SQLAlchemyError as e:
+            self.session.rollback()
+            raise e
+
+        if instance is not None:
+            return instance, True
+        try:
+            return self.session.query(self.model_class).filter_by(**lookup).one(), False
+        except NoResultFound:
+            raise ValueError(
+                f"{self.model_class.__name__} conflicts on {index_elements} "
+                f"with a row that doesn't match {lookup}"
+            ) from None
+
     def get_by_id(self, id: UUID) -> Optional[T]:
         """
         Get a model instance by its ID.
@@ -158,11 +215,11 @@ class BaseRepository(Generic[T]):
         if filters:
             query = query.filter_by(**filters)
         
-        total = query.count()
+        offset = (page - 1) * per_page
+        items = query.offset(offset).limit(per_page).all()
+        total = self._page_total(query, offset, per_page, items)
         pages = (total + per_page - 1) // per_page
         
-        items = query.offset((page - 1) * per_page).limit(per_page).all()
-        
         return {
             'items': items,
             'total': total,
@@ -171,6 +228,19 @@ class BaseRepository(Generic[T]):
             'pages': pages
         }
     
+    @staticmethod
+    def _page_total(query, offset: int, limit: int, items: list) -> int:
+        """
+        Total row count for a page already fetched from query.
+        
+        A short page is the last one, so the total follows from the offset
+        and the COUNT(*) round-trip is only issued for full or out-of-range
+        pages.
+        """
+        if len(items) < limit and (items or offset == 0):
+            return offset + len(items)
+        return query.count()
+    
     def create_many(self, items: List[Dict[str, Any]]) -> List[T]:
         """
         Create multiple instances in bulk.
@@ -73,14 +73,15 @@ class TelegramIngestedFileRepository(BaseRepository[TelegramIngestedFile]):
             .filter_by(telegram_chat_id=chat_id)
             .order_by(TelegramIngestedFile.processed_at.desc())
         )
-        total = query.count()
         items = query.offset(offset).limit(limit).all()
+        total = self._page_total(query, offset, limit, items)
         return items, total
 
 
 class TelegramPollingStateRepository:
-    def __init__(self):
-        self.session = db.session
+    @property
+    def session(self):
+        return db.session
 
     def get_or_create(self) -> TelegramPollingState:
         state = self.session.query(TelegramPollingState).filter_by(id=1).first()
@@ -225,13 +225,14 @@ class WorkCardRepository(BaseRepository[WorkCard]):
         if month:
             query = query.filter(WorkCard.processing_month == month)
 
-        total = query.count()
+        offset = (page - 1) * page_size
         items = (
             query.order_by(WorkCard.created_at.desc())
-            .offset((page - 1) * page_size)
+            .offset(offset)
             .limit(page_size)
             .all()
         )
+        total = self._page_total(query, offset, page_size, items)
 
         return {
             'items': items,
@@ -69,12 +69,17 @@ def load_hours_matrix_rows(session, business_id, site_id, processing_month, appr
 def build_matrix_and_status_map(rows):
     matrix = {}
     status_map = {}
+    # Priority of the status currently held in status_map, so each row costs
+    # one priority lookup instead of two.
+    best_priority = {}
+    status_priority = _STATUS_PRIORITY.get
 
     for employee_id, review_status, day_of_month, total_hours in rows:
         employee_id_str = str(employee_id)
 
-        current_status = status_map.get(employee_id_str)
-        if _STATUS_PRIORITY.get(review_status, 0) >= _STATUS_PRIORITY.get(current_status, 0):
+        priority = status_priority(review_status, 0)
+        if priority >= best_priority.get(employee_id_str, 0):
+            best_priority[employee_id_str] = priority
             status_map[employee_id_str] = review_status
 
         if day_of_month is None or total_hours is None:
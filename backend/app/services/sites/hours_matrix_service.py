@@ -3,6 +3,7 @@ from typing import Dict
 from uuid import UUID
 
 from sqlalchemy import and_, case, func
+from sqlalchemy.orm import raiseload
 
 from ...extensions import db
 from ...models.sites import Employee
@@ -53,6 +54,10 @@ def get_latest_work_card_with_extraction_by_employee(
     ).filter(
         Employee.site_id == site_id,
         Employee.business_id == business_id,
+    ).options(
+        # Everything the endpoint needs is in this one row set; a lazy load
+        # off Employee would reintroduce a query per employee.
+        raiseload('*'),
     ).all()
 
 
@@ -0,0 +1,14 @@
+from functools import lru_cache
+
+from dotenv import load_dotenv
+
+
+@lru_cache(maxsize=1)
+def ensure_env():
+    """Load `.env` into os.environ once per process.
+
+    Entry points and test modules all call this before building the app;
+    only the first call parses the file, later calls are no-ops. Variables
+    already set in the environment are never overridden.
+    """
+    return load_dotenv(override=False)
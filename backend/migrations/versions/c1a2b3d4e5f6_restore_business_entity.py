@@ -9,7 +9,6 @@ from alembic import op
 import sqlalchemy as sa
 from sqlalchemy.dialects import postgresql
 import uuid
-import re
 
 # revision identifiers, used by Alembic.
 revision = 'c1a2b3d4e5f6'
@@ -18,19 +17,27 @@ branch_labels = None
 depends_on = None
 
 
-def slugify(text):
-    """Convert text to URL-friendly slug."""
-    if not text:
-        return 'default'
-    # Lowercase and replace spaces/special chars with hyphens
-    text = text.lower().strip()
-    text = re.sub(r'[^\w\s-]', '', text)
-    text = re.sub(r'[\s_-]+', '-', text)
-    text = text.strip('-')
-    return text or 'default'
+# Tables scoped to a business; each gets business_id and fk_<table>_business_id.
+BUSINESS_TABLES = ('users', 'sites', 'employees', 'work_cards', 'export_runs', 'audit_events')
+
+# Non-unique indexes built concurrently once the business_id columns exist.
+BUSINESS_INDEXES = (
+    ('ix_users_business_id', 'users', ['business_id']),
+    ('ix_sites_business_id', 'sites', ['business_id']),
+    ('ix_employees_business_id', 'employees', ['business_id']),
+    ('ix_work_cards_business_id', 'work_cards', ['business_id']),
+    ('ix_work_cards_business_site_month', 'work_cards', ['business_id', 'site_id', 'processing_month']),
+    ('ix_export_runs_business_id', 'export_runs', ['business_id']),
+    ('ix_export_runs_business_month_site', 'export_runs', ['business_id', 'processing_month', 'site_id']),
+    ('ix_audit_events_business_id', 'audit_events', ['business_id']),
+    ('ix_audit_events_business_site_time', 'audit_events', ['business_id', 'site_id', 'created_at']),
+)
 
 
 def upgrade():
+    # Resolve the migration connection once; every raw statement below reuses it.
+    conn = op.get_bind()
+
     # 1. Create businesses table
     op.create_table('businesses',
         sa.Column('id', postgresql.UUID(as_uuid=True), nullable=False, default=uuid.uuid4),
@@ -43,80 +50,64 @@ def upgrade():
         sa.UniqueConstraint('code', name='uq_businesses_code')
     )
 
-    # 2. Create a default business
-    conn = op.get_bind()
-    default_business_id = uuid.uuid4()
-    conn.execute(sa.text("""
+    # 2. Create a default business; the server generates the id and hands it
+    # back in the same round-trip.
+    default_business_id = conn.execute(sa.text("""
         INSERT INTO businesses (id, name, code, is_active, created_at, updated_at)
-        VALUES (:id, 'AutomateHQ', 'automatehq', true, NOW(), NOW())
-    """), {'id': default_business_id})
-
-    # 3. Add business_id to all tables (with default value)
-    with op.batch_alter_table('users', schema=None) as batch_op:
-        batch_op.add_column(sa.Column('business_id', postgresql.UUID(as_uuid=True), nullable=True))
-    conn.execute(sa.text("UPDATE users SET business_id = :id"), {'id': default_business_id})
-
-    with op.batch_alter_table('sites', schema=None) as batch_op:
-        batch_op.add_column(sa.Column('business_id', postgresql.UUID(as_uuid=True), nullable=True))
-    conn.execute(sa.text("UPDATE sites SET business_id = :id"), {'id': default_business_id})
-
-    with op.batch_alter_table('employees', schema=None) as batch_op:
-        batch_op.add_column(sa.Column('business_id', postgresql.UUID(as_uuid=True), nullable=True))
-    conn.execute(sa.text("UPDATE employees SET business_id = :id"), {'id': default_business_id})
-
-    with op.batch_alter_table('work_cards', schema=None) as batch_op:
-        batch_op.add_column(sa.Column('business_id', postgresql.UUID(as_uuid=True), nullable=True))
-    conn.execute(sa.text("UPDATE work_cards SET business_id = :id"), {'id': default_business_id})
-
-    with op.batch_alter_table('export_runs', schema=None) as batch_op:
-        batch_op.add_column(sa.Column('business_id', postgresql.UUID(as_uuid=True), nullable=True))
-    conn.execute(sa.text("UPDATE export_runs SET business_id = :id"), {'id': default_business_id})
-
-    with op.batch_alter_table('audit_events', schema=None) as batch_op:
-        batch_op.add_column(sa.Column('business_id', postgresql.UUID(as_uuid=True), nullable=True))
-    conn.execute(sa.text("UPDATE audit_events SET business_id = :id"), {'id': default_business_id})
-
-    # 4. Make business_id NOT NULL and add foreign keys and indexes
+        VALUES (gen_random_uuid(), 'AutomateHQ', 'automatehq', true, NOW(), NOW())
+        RETURNING id
+    """)).scalar_one()
+
+    # 3. Add business_id to all tables. A constant server default backfills
+    # existing rows as a catalog-only change (PostgreSQL 11+), so there is no
+    # UPDATE pass over each table; step 4 drops the default again. DDL
+    # defaults cannot take bind parameters, so pass a plain string and let
+    # SQLAlchemy quote and escape the literal.
+    business_default = str(default_business_id)
+    for table_name in BUSINESS_TABLES:
+        op.add_column(table_name, sa.Column('business_id', postgresql.UUID(as_uuid=True), nullable=True, server_default=business_default))
+
+    # 4. Make business_id NOT NULL and add unique indexes. Foreign keys are
+    # created NOT VALID so no table is scanned while the lock is held.
     with op.batch_alter_table('users', schema=None) as batch_op:
-        batch_op.alter_column('business_id', nullable=False)
-        batch_op.create_foreign_key('fk_users_business_id', 'businesses', ['business_id'], ['id'])
-        batch_op.create_index('ix_users_business_id', ['business_id'])
+        batch_op.alter_column('business_id', nullable=False, server_default=None)
+        batch_op.create_foreign_key('fk_users_business_id', 'businesses', ['business_id'], ['id'], postgresql_not_valid=True)
 
     with op.batch_alter_table('sites', schema=None) as batch_op:
-        batch_op.alter_column('business_id', nullable=False)
-        batch_op.create_foreign_key('fk_sites_business_id', 'businesses', ['business_id'], ['id'])
-        batch_op.create_index('ix_sites_business_id', ['business_id'])
+        batch_op.alter_column('business_id', nullable=False, server_default=None)
+        batch_op.create_foreign_key('fk_sites_business_id', 'businesses', ['business_id'], ['id'], postgresql_not_valid=True)
         batch_op.drop_constraint('sites_site_name_key', type_='unique')
         batch_op.create_unique_constraint('uq_sites_business_name', ['business_id', 'site_name'])
 
     with op.batch_alter_table('employees', schema=None) as batch_op:
-        batch_op.alter_column('business_id', nullable=False)
-        batch_op.create_foreign_key('fk_employees_business_id', 'businesses', ['business_id'], ['id'])
-        batch_op.create_index('ix_employees_business_id', ['business_id'])
+        batch_op.alter_column('business_id', nullable=False, server_default=None)
+        batch_op.create_foreign_key('fk_employees_business_id', 'businesses', ['business_id'], ['id'], postgresql_not_valid=True)
         # Drop old unique index on passport_id and create business-scoped one
         batch_op.drop_index('ix_employees_passport_id')
         batch_op.create_index('ix_employees_business_passport', ['business_id', 'passport_id'], unique=True, postgresql_where=sa.text('passport_id IS NOT NULL'))
 
     with op.batch_alter_table('work_cards', schema=None) as batch_op:
-        batch_op.alter_column('business_id', nullable=False)
-        batch_op.create_foreign_key('fk_work_cards_business_id', 'businesses', ['business_id'], ['id'])
-        batch_op.create_index('ix_work_cards_business_id', ['business_id'])
+        batch_op.alter_column('business_id', nullable=False, server_default=None)
+        batch_op.create_foreign_key('fk_work_cards_business_id', 'businesses', ['business_id'], ['id'], postgresql_not_valid=True)
         batch_op.drop_index('ix_work_cards_site_month')
-        batch_op.create_index('ix_work_cards_business_site_month', ['business_id', 'site_id', 'processing_month'])
 
     with op.batch_alter_table('export_runs', schema=None) as batch_op:
-        batch_op.alter_column('business_id', nullable=False)
-        batch_op.create_foreign_key('fk_export_runs_business_id', 'businesses', ['business_id'], ['id'])
-        batch_op.create_index('ix_export_runs_business_id', ['business_id'])
+        batch_op.alter_column('business_id', nullable=False, server_default=None)
+        batch_op.create_foreign_key('fk_export_runs_business_id', 'businesses', ['business_id'], ['id'], postgresql_not_valid=True)
         batch_op.drop_index('ix_export_runs_month_site')
-        batch_op.create_index('ix_export_runs_business_month_site', ['business_id', 'processing_month', 'site_id'])
 
     with op.batch_alter_table('audit_events', schema=None) as batch_op:
-        batch_op.alter_column('business_id', nullable=False)
-        batch_op.create_foreign_key('fk_audit_events_business_id', 'businesses', ['business_id'], ['id'])
-        batch_op.create_index('ix_audit_events_business_id', ['business_id'])
+        batch_op.alter_column('business_id', nullable=False, server_default=None)
+        batch_op.create_foreign_key('fk_audit_events_business_id', 'businesses', ['business_id'], ['id'], postgresql_not_valid=True)
         batch_op.drop_index('ix_audit_events_site_time')
-        batch_op.create_index('ix_audit_events_business_site_time', ['business_id', 'site_id', 'created_at'])
+
+    # 5. Validate the foreign keys and build the non-unique business indexes
+    # outside the migration transaction so writers are not blocked meanwhile.
+    with op.get_context().autocommit_block():
+        for table_name in BUSINESS_TABLES:
+            op.execute(f'ALTER TABLE {table_name} VALIDATE CONSTRAINT fk_{table_name}_business_id')
+        for index_name, table_name, columns in BUSINESS_INDEXES:
+            op.create_index(index_name, table_name, columns, postgresql_concurrently=True)
 
 
 def downgrade():
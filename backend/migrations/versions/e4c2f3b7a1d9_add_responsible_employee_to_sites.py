@@ -26,7 +26,10 @@ def upgrade():
             ['id'],
             ondelete='SET NULL'
         )
-        batch_op.create_index('ix_sites_responsible_employee_id', ['responsible_employee_id'], unique=False)
+
+    # Build the index without holding a write lock on sites.
+    with op.get_context().autocommit_block():
+        op.create_index('ix_sites_responsible_employee_id', 'sites', ['responsible_employee_id'], unique=False, postgresql_concurrently=True)
 
 
 def downgrade():
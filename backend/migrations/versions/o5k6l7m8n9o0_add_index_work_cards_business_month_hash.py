@@ -15,11 +15,14 @@ depends_on = None
 
 
 def upgrade():
-    op.create_index(
-        'ix_work_cards_business_month_hash',
-        'work_cards',
-        ['business_id', 'processing_month', 'sha256_hash'],
-    )
+    # work_cards is the busiest table; build concurrently so uploads keep flowing.
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_work_cards_business_month_hash',
+            'work_cards',
+            ['business_id', 'processing_month', 'sha256_hash'],
+            postgresql_concurrently=True,
+        )
 
 
 def downgrade():
@@ -26,7 +26,10 @@ def upgrade():
             ['id'],
             ondelete='SET NULL'
         )
-        batch_op.create_index('ix_sites_field_manager_id', ['field_manager_id'], unique=False)
+
+    # Build the index without holding a write lock on sites.
+    with op.get_context().autocommit_block():
+        op.create_index('ix_sites_field_manager_id', 'sites', ['field_manager_id'], unique=False, postgresql_concurrently=True)
 
 
 def downgrade():
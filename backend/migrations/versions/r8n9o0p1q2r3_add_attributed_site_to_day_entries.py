@@ -28,9 +28,12 @@ def upgrade():
         'work_card_day_entries', 'sites',
         ['attributed_site_id'], ['id'])
     # Export aggregation looks up entries by attributed_site_id, so index it.
-    op.create_index(
-        'ix_work_card_day_entries_attributed_site_id',
-        'work_card_day_entries', ['attributed_site_id'])
+    # Built concurrently so day-entry writes are not blocked during the build.
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_work_card_day_entries_attributed_site_id',
+            'work_card_day_entries', ['attributed_site_id'],
+            postgresql_concurrently=True)
 
 
 def downgrade():
@@ -0,0 +1,32 @@
+"""add index on employees (business_id, external_employee_id)
+
+Revision ID: s9o0p1q2r3s4
+Revises: c4d5e6f7a8b9
+Create Date: 2026-10-17 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = 's9o0p1q2r3s4'
+down_revision = 'c4d5e6f7a8b9'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Not unique: external ids come from customer payroll exports and are not
+    # guaranteed to be unique within a business.
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_employees_business_external_id',
+            'employees',
+            ['business_id', 'external_employee_id'],
+            postgresql_where=sa.text('external_employee_id IS NOT NULL'),
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade():
+    op.drop_index('ix_employees_business_external_id', table_name='employees')
@@ -0,0 +1,32 @@
+"""add covering index for the hours-matrix best-card query
+
+Revision ID: t0p1q2r3s4t5
+Revises: s9o0p1q2r3s4
+Create Date: 2026-10-17 00:00:00.000000
+
+"""
+from alembic import op
+
+
+revision = 't0p1q2r3s4t5'
+down_revision = 's9o0p1q2r3s4'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # The matrix ranks cards by (business_id, processing_month, employee_id IN ...)
+    # and reads only the INCLUDE columns, so Postgres can answer it with an
+    # index-only scan instead of a heap fetch per card.
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_work_cards_matrix_cover',
+            'work_cards',
+            ['business_id', 'processing_month', 'employee_id'],
+            postgresql_include=['id', 'site_id', 'review_status', 'monthly_total_hours', 'created_at'],
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade():
+    op.drop_index('ix_work_cards_matrix_cover', table_name='work_cards')
@@ -0,0 +1,37 @@
+"""drop single-column business_id indexes covered by composite indexes
+
+Revision ID: u1q2r3s4t5u6
+Revises: t0p1q2r3s4t5
+Create Date: 2026-10-17 00:00:00.000000
+
+"""
+from alembic import op
+
+
+revision = 'u1q2r3s4t5u6'
+down_revision = 't0p1q2r3s4t5'
+branch_labels = None
+depends_on = None
+
+
+# Each of these tables has a full (non-partial) index or unique constraint
+# leading with business_id, which serves WHERE business_id = ? just as well.
+# employees (only partial composites) and users (no composite) keep theirs.
+REDUNDANT_INDEXES = (
+    ('ix_work_cards_business_id', 'work_cards'),
+    ('ix_export_runs_business_id', 'export_runs'),
+    ('ix_audit_events_business_id', 'audit_events'),
+    ('ix_sites_business_id', 'sites'),
+)
+
+
+def upgrade():
+    with op.get_context().autocommit_block():
+        for index_name, table_name in REDUNDANT_INDEXES:
+            op.drop_index(index_name, table_name=table_name, postgresql_concurrently=True)
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        for index_name, table_name in REDUNDANT_INDEXES:
+            op.create_index(index_name, table_name, ['business_id'], postgresql_concurrently=True)
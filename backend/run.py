@@ -1,11 +1,18 @@
-from dotenv import load_dotenv
-load_dotenv()
+import os
+
+from env import ensure_env
+ensure_env()
 
 from app import create_app
 
 app = create_app()
 
 if __name__ == "__main__":
-    # threaded=True allows handling multiple concurrent requests
-    # This prevents request queue blocking when browser sends parallel requests
-    app.run(host="0.0.0.0", port=5000, debug=True, threaded=True)
+    # Local development only; production serves `run:app` through gunicorn
+    # workers (see Procfile). threaded=True allows handling multiple concurrent
+    # requests so the browser's parallel requests don't queue behind each other.
+    # Set FLASK_RELOAD=0 when profiling: the reloader's file-stat polling and
+    # extra child process skew timings.
+    debug = os.environ.get("FLASK_ENV", "development") == "development"
+    use_reloader = debug and os.environ.get("FLASK_RELOAD", "1") == "1"
+    app.run(host="0.0.0.0", port=5000, debug=debug, threaded=True, use_reloader=use_reloader)
@@ -1,89 +1,85 @@
 import os
-from dotenv import load_dotenv
+from contextlib import contextmanager
+from types import SimpleNamespace
+from sqlalchemy import text
+from env import ensure_env
+
+# Before any app import: modules read settings from os.environ at import time.
+ensure_env()
+
 from werkzeug.security import generate_password_hash
-from app import create_app
+from app import create_app, db
 from app.repositories.business_repository import BusinessRepository
 from app.repositories.user_repository import UserRepository
 from app.repositories.site_repository import SiteRepository
 from app.repositories.employee_repository import EmployeeRepository
 
-load_dotenv()
-
 
-def seed_business():
+def seed_business(repos):
     """Seed the default business if it doesn't exist."""
-    business_repo = BusinessRepository()
-
-    existing_business = business_repo.get_by_code('automatehq')
-    if existing_business:
-        print("Default business 'AutomateHQ' already exists.")
-        return existing_business
-
-    print("Creating default business 'AutomateHQ'...")
     try:
-        business = business_repo.create(
-            name='AutomateHQ',
+        business, created = repos.business.get_or_create(
             code='automatehq',
-            is_active=True
+            conflict_target=['code'],
+            defaults={'name': 'AutomateHQ', 'is_active': True},
         )
-        print("Default business created successfully.")
-        return business
     except Exception as e:
         print(f"Failed to create default business: {e}")
         return None
 
+    if created:
+        print("Default business 'AutomateHQ' created successfully.")
+    else:
+        print("Default business 'AutomateHQ' already exists.")
+    return business
+
 
-def seed_admin(business):
+def seed_admin(business, repos):
     """Seed the default admin user if it doesn't exist."""
-    user_repo = UserRepository()
-
     email = os.environ.get('ADMIN_EMAIL', 'admin@example.com')
     password = os.environ.get('ADMIN_PASSWORD', 'password123')
 
-    existing_user = user_repo.get_by_email(email)
-    if existing_user:
-        print(f"Admin user {email} already exists.")
-        return
-
-    print(f"Creating admin user {email}...")
-
     try:
-        user_repo.create(
-            full_name='System Admin',
+        _, created = repos.user.get_or_create(
             email=email,
-            role='ADMIN',
-            business_id=business.id,
-            password_hash=generate_password_hash(password, method='pbkdf2:sha256'),
-            is_active=True,
+            conflict_target=['email'],
+            defaults={
+                'full_name': 'System Admin',
+                'role': 'ADMIN',
+                'business_id': business.id,
+                'password_hash': generate_password_hash(password, method='pbkdf2:sha256'),
+                'is_active': True,
+            },
         )
-        print("Admin user created successfully.")
     except Exception as e:
         print(f"Failed to create admin user: {e}")
+        return
 
+    if created:
+        print(f"Admin user {email} created successfully.")
+    else:
+        print(f"Admin user {email} already exists.")
 
-def seed_site(business):
-    """Seed a demo site if it doesn't exist."""
-    site_repo = SiteRepository()
-
-    existing_site = site_repo.get_by_name_and_business('Tel Aviv HQ', business.id)
-    if existing_site:
-        print("Demo site 'Tel Aviv HQ' already exists.")
-        return existing_site
 
-    print("Creating demo site 'Tel Aviv HQ'...")
+def seed_site(business, repos):
+    """Seed a demo site if it doesn't exist."""
     try:
-        site = site_repo.create(
-            site_name='Tel Aviv HQ',
-            site_code='TLV-001',
+        site, created = repos.site.get_or_create(
             business_id=business.id,
-            is_active=True,
+            site_name='Tel Aviv HQ',
+            conflict_target=['business_id', 'site_name'],
+            defaults={'site_code': 'TLV-001', 'is_active': True},
         )
-        print("Demo site created successfully.")
-        return site
     except Exception as e:
         print(f"Failed to create demo site: {e}")
         return None
 
+    if created:
+        print("Demo site 'Tel Aviv HQ' created successfully.")
+    else:
+        print("Demo site 'Tel Aviv HQ' already exists.")
+    return site
+
 
 DEMO_EMPLOYEES = [
     {'full_name': 'David Cohen', 'passport_id': 'IL-100001', 'phone_number': '050-1111111'},
@@ -94,47 +90,83 @@ DEMO_EMPLOYEES = [
 ]
 
 
-def seed_employees(business, site):
+@contextmanager
+def _bulk_mode():
+    """Skip foreign-key triggers for the rest of the current transaction.
+
+    Only applies on PostgreSQL. ``SET LOCAL`` lapses at commit or rollback,
+    so the setting never leaks into pooled connections. Changing
+    ``session_replication_role`` needs a superuser, so other roles are
+    checked up front and seed with foreign-key checks on.
+    """
+    if db.engine.dialect.name == 'postgresql':
+        is_superuser = db.session.execute(
+            text("SELECT rolsuper FROM pg_roles WHERE rolname = current_user")
+        ).scalar()
+        if is_superuser:
+            db.session.execute(text("SET LOCAL session_replication_role = 'replica'"))
+        else:
+            print("  Bulk mode skipped (role is not a superuser); foreign-key checks stay on.")
+    yield
+
+
+def seed_employees(business, site, repos):
     """Seed demo employees if they don't exist."""
-    employee_repo = EmployeeRepository()
+    existing_passports = {
+        employee.passport_id
+        for employee in repos.employee.get_by_passports(
+            [emp['passport_id'] for emp in DEMO_EMPLOYEES], business.id
+        )
+    }
 
+    new_employees = []
     for emp in DEMO_EMPLOYEES:
-        existing = employee_repo.get_by_passport(emp['passport_id'], business.id)
-        if existing:
+        if emp['passport_id'] in existing_passports:
             print(f"  Employee '{emp['full_name']}' already exists.")
             continue
+        new_employees.append({
+            **emp,
+            'business_id': business.id,
+            'site_id': site.id,
+            'is_active': True,
+        })
+
+    if not new_employees:
+        return
 
-        try:
-            employee_repo.create(
-                full_name=emp['full_name'],
-                passport_id=emp['passport_id'],
-                phone_number=emp['phone_number'],
-                business_id=business.id,
-                site_id=site.id,
-                is_active=True,
-            )
+    try:
+        with _bulk_mode():
+            repos.employee.create_many(new_employees)
+        for emp in new_employees:
             print(f"  Created employee '{emp['full_name']}'.")
-        except Exception as e:
-            print(f"  Failed to create employee '{emp['full_name']}': {e}")
+    except Exception as e:
+        print(f"  Failed to create demo employees: {e}")
 
 
 def seed_all():
     app = create_app()
     with app.app_context():
-        business = seed_business()
+        repos = SimpleNamespace(
+            business=BusinessRepository(),
+            user=UserRepository(),
+            site=SiteRepository(),
+            employee=EmployeeRepository(),
+        )
+
+        business = seed_business(repos)
         if not business:
             print("Cannot seed without a business.")
             return
 
-        seed_admin(business)
+        seed_admin(business, repos)
 
-        site = seed_site(business)
+        site = seed_site(business, repos)
         if not site:
             print("Cannot seed employees without a site.")
             return
 
         print("Creating demo employees...")
-        seed_employees(business, site)
+        seed_employees(business, site, repos)
 
         print("\nSeed complete!")
 
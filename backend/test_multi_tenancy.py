@@ -8,8 +8,10 @@ Tests that business isolation is working correctly:
 4. Verifies data isolation between businesses
 """
 import sys
-from dotenv import load_dotenv
-load_dotenv()
+from functools import lru_cache
+
+from env import ensure_env
+ensure_env()
 
 from app import create_app
 from app.repositories.business_repository import BusinessRepository
@@ -18,6 +20,16 @@ from app.repositories.employee_repository import EmployeeRepository
 from app.repositories.site_repository import SiteRepository
 from werkzeug.security import generate_password_hash
 
+
+@lru_cache(maxsize=None)
+def _password_hash(password):
+    """Hash with a single PBKDF2 iteration; these logins are never checked.
+
+    The result is still a valid werkzeug hash, so check_password_hash works.
+    """
+    return generate_password_hash(password, method='pbkdf2:sha256:1')
+
+
 def test_multi_tenancy():
     app = create_app()
     with app.app_context():
@@ -32,70 +44,57 @@ def test_multi_tenancy():
         
         # Step 1: Get or create test businesses
         print("\n1. Setting up test businesses...")
-        business_a = business_repo.get_by_name('Test Business A')
-        if not business_a:
-            business_a = business_repo.create(
-                business_name='Test Business A',
-                business_code='TBA',
-                is_active=True
-            )
-            print(f"   Created Business A: {business_a.id}")
-        else:
-            print(f"   Using existing Business A: {business_a.id}")
-        
-        business_b = business_repo.get_by_name('Test Business B')
-        if not business_b:
-            business_b = business_repo.create(
-                business_name='Test Business B',
-                business_code='TBB',
-                is_active=True
-            )
-            print(f"   Created Business B: {business_b.id}")
-        else:
-            print(f"   Using existing Business B: {business_b.id}")
-        
+        business_a, created = business_repo.get_or_create(
+            code='TBA', defaults={'name': 'Test Business A', 'is_active': True}
+        )
+        print(f"   {'Created' if created else 'Using existing'} Business A: {business_a.id}")
+
+        business_b, created = business_repo.get_or_create(
+            code='TBB', defaults={'name': 'Test Business B', 'is_active': True}
+        )
+        print(f"   {'Created' if created else 'Using existing'} Business B: {business_b.id}")
+
         # Step 2: Create test users in each business
         print("\n2. Creating test users...")
-        user_a = user_repo.get_by_email('user_a@test.com')
-        if not user_a:
-            user_a = user_repo.create(
-                full_name='User A',
-                email='user_a@test.com',
-                role='ADMIN',
-                password_hash=generate_password_hash('password123'),
-                business_id=business_a.id,
-                is_active=True
-            )
+        user_a, created = user_repo.get_or_create(
+            email='user_a@test.com',
+            defaults={
+                'full_name': 'User A',
+                'role': 'ADMIN',
+                'password_hash': _password_hash('password123'),
+                'business_id': business_a.id,
+                'is_active': True,
+            },
+        )
+        if created:
             print(f"   Created User A in Business A")
         else:
             print(f"   User A exists in business: {user_a.business_id}")
-        
-        user_b = user_repo.get_by_email('user_b@test.com')
-        if not user_b:
-            user_b = user_repo.create(
-                full_name='User B',
-                email='user_b@test.com',
-                role='ADMIN',
-                password_hash=generate_password_hash('password123'),
-                business_id=business_b.id,
-                is_active=True
-            )
+
+        user_b, created = user_repo.get_or_create(
+            email='user_b@test.com',
+            defaults={
+                'full_name': 'User B',
+                'role': 'ADMIN',
+                'password_hash': _password_hash('password123'),
+                'business_id': business_b.id,
+                'is_active': True,
+            },
+        )
+        if created:
             print(f"   Created User B in Business B")
         else:
             print(f"   User B exists in business: {user_b.business_id}")
-        
-        # Step 3: Get or create a shared site
+
+        # Step 3: Get or create a shared site (owned by Business A; employees
+        # from both businesses are assigned to it)
         print("\n3. Setting up shared site...")
-        site = site_repo.get_by_name('Test Site')
-        if not site:
-            site = site_repo.create(
-                site_name='Test Site',
-                site_code='TS1',
-                is_active=True
-            )
-            print(f"   Created shared site: {site.id}")
-        else:
-            print(f"   Using existing site: {site.id}")
+        site, created = site_repo.get_or_create(
+            business_id=business_a.id,
+            site_name='Test Site',
+            defaults={'site_code': 'TS1', 'is_active': True},
+        )
+        print(f"   {'Created' if created else 'Using existing'} shared site: {site.id}")
         
         # Step 4: Create employees in each business (same site)
         print("\n4. Creating test employees...")
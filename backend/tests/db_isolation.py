@@ -0,0 +1,33 @@
+from sqlalchemy.orm import Session, scoped_session, sessionmaker
+
+from backend.app import db
+
+
+class RollbackIsolationMixin:
+    """
+    Runs each test inside one outer transaction that is rolled back afterwards.
+
+    db.session is swapped for a session bound to a single connection with
+    join_transaction_mode="create_savepoint", so commits and rollbacks made by
+    the code under test only touch savepoints and no rows ever reach the
+    database. Call isolate_database() from setUp once an app context is pushed.
+    """
+
+    def isolate_database(self):
+        connection = db.engine.connect()
+        self.addCleanup(connection.close)
+        transaction = connection.begin()
+        self.addCleanup(transaction.rollback)
+
+        # A plain Session: Flask-SQLAlchemy's own session class resolves the
+        # bind from db.engines and would ignore the connection.
+        session = scoped_session(sessionmaker(
+            bind=connection,
+            class_=Session,
+            join_transaction_mode="create_savepoint",
+            query_cls=db.Query,
+        ))
+        original_session = db.session
+        db.session = session
+        self.addCleanup(setattr, db, "session", original_session)
+        self.addCleanup(session.remove)
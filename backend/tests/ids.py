@@ -0,0 +1,13 @@
+import itertools
+import uuid
+
+_uuid_counter = itertools.count(1)
+
+
+def next_uuid():
+    """Unique, deterministic UUID for tests that never need random ids.
+
+    Built from a counter, so ids are reproducible between runs and no call
+    reads os.urandom.
+    """
+    return uuid.UUID(int=next(_uuid_counter))
@@ -1,20 +1,26 @@
 import os
+import re
 import uuid
 import unittest
 from datetime import date
 from unittest.mock import patch
 
-from dotenv import load_dotenv
+from backend.env import ensure_env
 from sqlalchemy import event
 
-load_dotenv()
+ensure_env()
 
 from backend.app import create_app, db
+from backend.app.api import sites as sites_api
 from backend.app.auth_utils import encode_auth_token
 from backend.app.models.business import Business
 from backend.app.models.sites import Employee, Site
 from backend.app.models.upload_access import UploadAccessRequest
 from backend.app.models.users import User
+from backend.tests.db_isolation import RollbackIsolationMixin
+
+# Anchored, case-insensitive prefix match; avoids copying/upper-casing every statement.
+_SELECT_RE = re.compile(r'\s*select\b', re.IGNORECASE)
 
 
 class _FakeTwilioMessages:
@@ -27,22 +33,32 @@ class _FakeTwilioClient:
         self.messages = _FakeTwilioMessages()
 
 
-class AccessLinkQueryEfficiencyTests(unittest.TestCase):
-    def setUp(self):
+class AccessLinkQueryEfficiencyTests(RollbackIsolationMixin, unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
         os.environ.setdefault('JWT_SECRET_KEY', 'test-secret')
         os.environ['TWILIO_ACCOUNT_SID'] = 'sid'
         os.environ['TWILIO_AUTH_TOKEN'] = 'token'
         os.environ['TWILIO_WHATSAPP_NUMBER'] = 'whatsapp:+123456789'
 
-        self.app = create_app()
-        self.client = self.app.test_client()
-        self.app_context = self.app.app_context()
-        self.app_context.push()
+        cls.app = create_app()
+        cls.client = cls.app.test_client()
+        cls.app_context = cls.app.app_context()
+        cls.app_context.push()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.app_context.pop()
+
+    def setUp(self):
+        self.isolate_database()
 
         suffix = str(uuid.uuid4())[:8]
-        self.business = Business(name=f'Query Biz {suffix}', code=f'qb-{suffix}', is_active=True)
-        db.session.add(self.business)
-        db.session.flush()
+        # The business id is assigned client-side; the Business relationships
+        # let the unit of work insert it ahead of its children in one flush.
+        self.business = Business(
+            id=uuid.uuid4(), name=f'Query Biz {suffix}', code=f'qb-{suffix}', is_active=True
+        )
 
         self.user = User(
             business_id=self.business.id,
@@ -52,15 +68,22 @@ class AccessLinkQueryEfficiencyTests(unittest.TestCase):
             password_hash='x',
             is_active=True,
         )
-        db.session.add(self.user)
-
         self.site = Site(
             business_id=self.business.id,
             site_name=f'Query Site {suffix}',
             site_code=f'QS{suffix}',
             is_active=True,
         )
-        db.session.add(self.site)
+        self.batch_sites = [
+            Site(
+                business_id=self.business.id,
+                site_name=f'Batch Site {suffix}-{idx}',
+                site_code=f'B{idx}{suffix}',
+                is_active=True,
+            )
+            for idx in range(5)
+        ]
+        db.session.add_all([self.business, self.user, self.site, *self.batch_sites])
         db.session.flush()
 
         self.employee = Employee(
@@ -70,13 +93,25 @@ class AccessLinkQueryEfficiencyTests(unittest.TestCase):
             phone_number='0501234567',
             is_active=True,
         )
-        db.session.add(self.employee)
+        batch_employees = [
+            Employee(
+                business_id=self.business.id,
+                site_id=site.id,
+                full_name=f'Batch Employee {idx}',
+                phone_number='0501234567',
+                is_active=True,
+            )
+            for idx, site in enumerate(self.batch_sites)
+        ]
+        db.session.add_all([self.employee, *batch_employees])
         db.session.flush()
 
         self.site.responsible_employee_id = self.employee.id
+        for site, employee in zip(self.batch_sites, batch_employees):
+            site.responsible_employee_id = employee.id
 
-        for idx in range(5):
-            req = UploadAccessRequest(
+        db.session.add_all([
+            UploadAccessRequest(
                 token=f'token-{suffix}-{idx}',
                 business_id=self.business.id,
                 site_id=self.site.id,
@@ -85,51 +120,20 @@ class AccessLinkQueryEfficiencyTests(unittest.TestCase):
                 created_by_user_id=self.user.id,
                 is_active=True,
             )
-            db.session.add(req)
-
-        self.batch_sites = []
-        for idx in range(5):
-            site = Site(
-                business_id=self.business.id,
-                site_name=f'Batch Site {suffix}-{idx}',
-                site_code=f'B{idx}{suffix}',
-                is_active=True,
-            )
-            db.session.add(site)
-            db.session.flush()
-            employee = Employee(
-                business_id=self.business.id,
-                site_id=site.id,
-                full_name=f'Batch Employee {idx}',
-                phone_number='0501234567',
-                is_active=True,
-            )
-            db.session.add(employee)
-            db.session.flush()
-            site.responsible_employee_id = employee.id
-            self.batch_sites.append(site)
+            for idx in range(5)
+        ])
 
         db.session.commit()
 
         token = encode_auth_token(self.user.id)
         self.auth_headers = {'Authorization': f'Bearer {token}'}
 
-    def tearDown(self):
-        db.session.rollback()
-        db.session.query(UploadAccessRequest).filter_by(business_id=self.business.id).delete(synchronize_session=False)
-        db.session.query(Employee).filter_by(business_id=self.business.id).delete(synchronize_session=False)
-        db.session.query(Site).filter_by(business_id=self.business.id).delete(synchronize_session=False)
-        db.session.query(User).filter_by(id=self.user.id).delete(synchronize_session=False)
-        db.session.query(Business).filter_by(id=self.business.id).delete(synchronize_session=False)
-        db.session.commit()
-        self.app_context.pop()
-
     def _count_selects(self, func):
         select_count = 0
 
         def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
             nonlocal select_count
-            if statement.lstrip().upper().startswith('SELECT'):
+            if _SELECT_RE.match(statement):
                 select_count += 1
 
         event.listen(db.engine, 'before_cursor_execute', before_cursor_execute)
@@ -150,13 +154,22 @@ class AccessLinkQueryEfficiencyTests(unittest.TestCase):
     def test_send_whatsapp_batch_prefetch_query_counts_for_small_and_large_payloads(self):
         token_iter = iter([f'batch-token-{i}' for i in range(20)])
 
+        # Read the ids up front: the fixtures were expired by the setUp commit,
+        # so touching them inside the counted block would add refresh SELECTs.
+        batch_site_ids = [str(site.id) for site in self.batch_sites]
+
         def _call(site_count):
             payload = {
                 'processing_month': '2026-01-01',
-                'site_ids': [str(site.id) for site in self.batch_sites[:site_count]],
+                'site_ids': batch_site_ids[:site_count],
             }
             return self.client.post('/api/sites/access-links/whatsapp-batch', json=payload, headers=self.auth_headers)
 
+        # The Twilio client is memoized per credentials; start from an empty
+        # cache so the patched Client is the one that gets built, and drop the
+        # fake again afterwards.
+        sites_api._twilio_client.cache_clear()
+        self.addCleanup(sites_api._twilio_client.cache_clear)
         with patch('backend.app.api.sites.Client', _FakeTwilioClient), patch(
             'backend.app.api.sites._generate_access_token', side_effect=lambda: next(token_iter)
         ):
@@ -2,48 +2,32 @@ import unittest
 import json
 import uuid
 import os
-from dotenv import load_dotenv
+from datetime import date
+from backend.env import ensure_env
 
 # Load env vars before creating app
-load_dotenv()
+ensure_env()
 
 from backend.app import create_app, db
-from backend.app.models.sites import Site, Employee
-from backend.app.models.users import User
+from backend.app.models.work_cards import WorkCard
+from backend.tests.db_isolation import RollbackIsolationMixin
+
+class TestAPICrud(RollbackIsolationMixin, unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.app = create_app()
 
-class TestAPICrud(unittest.TestCase):
     def setUp(self):
-        self.app = create_app()
         self.client = self.app.test_client()
         self.app_context = self.app.app_context()
         self.app_context.push()
-        
-        # Create a clean state if needed, but for now we just rely on unique data
+
+        self.isolate_database()
+
         self.test_site_name = f"Test Site {uuid.uuid4()}"
         self.test_user_email = f"test_{uuid.uuid4()}@example.com"
-        
+
     def tearDown(self):
-        # Cleanup
-        try:
-            # Delete employees first (FK)
-            employees = Employee.query.filter(Employee.full_name.like("Test Employee%")).all()
-            for e in employees:
-                db.session.delete(e)
-            
-            # Delete sites
-            sites = Site.query.filter(Site.site_name.like("Test Site%")).all()
-            for s in sites:
-                db.session.delete(s)
-                
-            # Delete users
-            users = User.query.filter(User.email.like("test_%@example.com")).all()
-            for u in users:
-                db.session.delete(u)
-                
-            db.session.commit()
-        except:
-            db.session.rollback()
-        
         self.app_context.pop()
 
     def test_site_crud(self):
@@ -181,9 +165,6 @@ class TestAPICrud(unittest.TestCase):
         user_id = user_res.get_json()['data']['id']
 
         # Manual DB insertion for work card (since we don't have create API for it yet - comes from upload)
-        from backend.app.models.work_cards import WorkCard
-        from datetime import date
-        
         with self.app.app_context():
             wc = WorkCard(
                 site_id=site_id,
@@ -218,11 +199,6 @@ class TestAPICrud(unittest.TestCase):
         data = response.get_json()['data']
         self.assertEqual(data['review_status'], 'APPROVED')
         self.assertEqual(data['approved_by_user_id'], user_id)
-        
-        # Cleanup
-        with self.app.app_context():
-            WorkCard.query.filter_by(id=wc_id).delete()
-            db.session.commit()
 
     def test_work_card_assignment_transitions_to_needs_review(self):
         # Create site
@@ -240,9 +216,6 @@ class TestAPICrud(unittest.TestCase):
         })
         employee_id = employee_res.get_json()['data']['id']
 
-        from backend.app.models.work_cards import WorkCard
-        from datetime import date
-
         with self.app.app_context():
             wc = WorkCard(
                 site_id=site_id,
@@ -266,9 +239,5 @@ class TestAPICrud(unittest.TestCase):
         self.assertEqual(data['employee_id'], employee_id)
         self.assertEqual(data['review_status'], 'NEEDS_REVIEW')
 
-        with self.app.app_context():
-            WorkCard.query.filter_by(id=wc_id).delete()
-            db.session.commit()
-
 if __name__ == '__main__':
     unittest.main()
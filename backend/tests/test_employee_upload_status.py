@@ -1,5 +1,4 @@
 import unittest
-import uuid
 from unittest.mock import patch
 
 from flask import g
@@ -8,17 +7,21 @@ from backend.app import create_app
 from backend.app.api import sites
 from backend.app.models.sites import Employee
 from backend.app.services.sites.hours_matrix_service import build_employee_upload_status_map
+from backend.tests.ids import next_uuid
 
 
 class EmployeeUploadStatusTests(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.app = create_app()
+
     def setUp(self):
-        self.app = create_app()
-        self.business_id = uuid.uuid4()
-        self.site_id = uuid.uuid4()
+        self.business_id = next_uuid()
+        self.site_id = next_uuid()
 
     def _employee(self, name):
         return Employee(
-            id=uuid.uuid4(),
+            id=next_uuid(),
             business_id=self.business_id,
             site_id=self.site_id,
             full_name=name,
@@ -36,11 +39,11 @@ class EmployeeUploadStatusTests(unittest.TestCase):
 
         rows = [
             (no_cards, None, None, None),
-            (no_extraction, uuid.uuid4(), 'NEEDS_REVIEW', None),
-            (failed, uuid.uuid4(), 'NEEDS_REVIEW', 'FAILED'),
-            (pending, uuid.uuid4(), 'NEEDS_REVIEW', 'RUNNING'),
-            (approved_done, uuid.uuid4(), 'APPROVED', 'DONE'),
-            (extracted_done, uuid.uuid4(), 'NEEDS_REVIEW', 'DONE'),
+            (no_extraction, next_uuid(), 'NEEDS_REVIEW', None),
+            (failed, next_uuid(), 'NEEDS_REVIEW', 'FAILED'),
+            (pending, next_uuid(), 'NEEDS_REVIEW', 'RUNNING'),
+            (approved_done, next_uuid(), 'APPROVED', 'DONE'),
+            (extracted_done, next_uuid(), 'NEEDS_REVIEW', 'DONE'),
         ]
 
         status_map = build_employee_upload_status_map(rows)
@@ -64,7 +67,7 @@ class EmployeeUploadStatusTests(unittest.TestCase):
             self._employee('approved-done'),
             self._employee('extracted-done'),
         ]
-        work_card_ids = [uuid.uuid4() for _ in range(5)]
+        work_card_ids = [next_uuid() for _ in range(5)]
 
         mock_get_site.return_value = type('SiteStub', (), {'business_id': self.business_id})()
         mock_get_batched.return_value = [
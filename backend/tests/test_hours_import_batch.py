@@ -1,11 +1,12 @@
 import io
+import os
 import unittest
 import uuid
 from datetime import date
 
-from dotenv import load_dotenv
+from backend.env import ensure_env
 
-load_dotenv()
+ensure_env()
 
 from openpyxl import Workbook
 
@@ -16,6 +17,7 @@ from backend.app.models.business import Business
 from backend.app.models.sites import Site, Employee
 from backend.app.models.users import User
 from backend.app.models.work_cards import WorkCard, WorkCardDayEntry
+from backend.tests.db_isolation import RollbackIsolationMixin
 
 MONTH = '2026-05'
 MONTH_DATE = date(2026, 5, 1)
@@ -73,11 +75,16 @@ def _build_day_sheet(ws, passport_days, days_in_month):
                 ws.cell(row=day + 2, column=2 + i, value=daymap[day])
 
 
-class HoursImportBatchTests(unittest.TestCase):
+class HoursImportBatchTests(RollbackIsolationMixin, unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        os.environ.setdefault('JWT_SECRET_KEY', 'test-secret')
+        cls.app = create_app()
+
     def setUp(self):
-        self.app = create_app()
         self.ctx = self.app.app_context()
         self.ctx.push()
+        self.isolate_database()
         self.client = self.app.test_client()
 
         suffix = uuid.uuid4().hex[:8]
@@ -111,21 +118,7 @@ class HoursImportBatchTests(unittest.TestCase):
         self.headers = {'Authorization': f'Bearer {token}'}
 
     def tearDown(self):
-        try:
-            biz_id = self.business.id
-            card_ids = [c.id for c in WorkCard.query.filter_by(business_id=biz_id).all()]
-            if card_ids:
-                WorkCardDayEntry.query.filter(WorkCardDayEntry.work_card_id.in_(card_ids)).delete(synchronize_session=False)
-            WorkCard.query.filter_by(business_id=biz_id).delete(synchronize_session=False)
-            Employee.query.filter_by(business_id=biz_id).delete(synchronize_session=False)
-            Site.query.filter_by(business_id=biz_id).delete(synchronize_session=False)
-            User.query.filter_by(business_id=biz_id).delete(synchronize_session=False)
-            Business.query.filter_by(id=biz_id).delete(synchronize_session=False)
-            db.session.commit()
-        except Exception:
-            db.session.rollback()
-        finally:
-            self.ctx.pop()
+        self.ctx.pop()
 
     def _sheet_name(self, site):
         # Reproduce export naming over the sorted active site list
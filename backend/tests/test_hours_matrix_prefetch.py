@@ -1,9 +1,16 @@
 import unittest
-import uuid
+from collections import namedtuple
 from types import SimpleNamespace
 from unittest.mock import patch
 
 from backend.app.api import sites as sites_api
+from backend.tests.ids import next_uuid
+
+
+# Lightweight row records; the loader only reads these attributes.
+_Employee = namedtuple('_Employee', 'id site_id full_name passport_id')
+_BestCard = namedtuple('_BestCard', 'work_card_id site_id employee_id review_status monthly_total_hours')
+_DayEntry = namedtuple('_DayEntry', 'work_card_id day_of_month total_hours day_status attributed_site_id')
 
 
 class _FakeQuery:
@@ -24,6 +31,9 @@ class _FakeQuery:
     def join(self, *args, **kwargs):
         return self
 
+    def options(self, *args):
+        return self
+
     def distinct(self):
         return self
 
@@ -48,33 +58,33 @@ class _FakeSession:
         return query
 
 
-def _ranked_subquery():
-    return SimpleNamespace(
-        c=SimpleNamespace(
-            work_card_id='work_card_id',
-            site_id='site_id',
-            employee_id='employee_id',
-            review_status='review_status',
-            monthly_total_hours='monthly_total_hours',
-            rank='rank',
-        )
+# Only read by the loader, so one shared instance serves every test.
+_RANKED_SUBQUERY = SimpleNamespace(
+    c=SimpleNamespace(
+        work_card_id='work_card_id',
+        site_id='site_id',
+        employee_id='employee_id',
+        review_status='review_status',
+        monthly_total_hours='monthly_total_hours',
+        rank='rank',
     )
+)
 
 
 class LoadHoursMatrixForSitesTests(unittest.TestCase):
     def test_bulk_loader_uses_fixed_query_budget_for_many_sites(self):
-        site_ids = [uuid.uuid4() for _ in range(60)]
+        site_ids = [next_uuid() for _ in range(60)]
         employees = []
         for index, site_id in enumerate(site_ids):
-            employees.append(SimpleNamespace(id=uuid.uuid4(), site_id=site_id, full_name=f'B-{index}', passport_id='P2'))
-            employees.append(SimpleNamespace(id=uuid.uuid4(), site_id=site_id, full_name=f'A-{index}', passport_id='P1'))
+            employees.append(_Employee(id=next_uuid(), site_id=site_id, full_name=f'B-{index}', passport_id='P2'))
+            employees.append(_Employee(id=next_uuid(), site_id=site_id, full_name=f'A-{index}', passport_id='P1'))
 
         best_cards_rows = []
         day_entries = []
         for employee in employees[:20]:
-            work_card_id = uuid.uuid4()
+            work_card_id = next_uuid()
             best_cards_rows.append(
-                SimpleNamespace(
+                _BestCard(
                     work_card_id=work_card_id,
                     site_id=employee.site_id,
                     employee_id=employee.id,
@@ -82,7 +92,7 @@ class LoadHoursMatrixForSitesTests(unittest.TestCase):
                     monthly_total_hours=None,
                 )
             )
-            day_entries.append(SimpleNamespace(
+            day_entries.append(_DayEntry(
                 work_card_id=work_card_id, day_of_month=1, total_hours=8.0,
                 day_status=None, attributed_site_id=None,
             ))
@@ -92,7 +102,7 @@ class LoadHoursMatrixForSitesTests(unittest.TestCase):
         fake_session = _FakeSession([
             _FakeQuery(stage='home_employees', data=employees),
             _FakeQuery(stage='visiting_ids', data=[]),
-            _FakeQuery(stage='ranked_cards', subquery_obj=_ranked_subquery()),
+            _FakeQuery(stage='ranked_cards', subquery_obj=_RANKED_SUBQUERY),
             _FakeQuery(stage='best_cards', data=best_cards_rows),
             _FakeQuery(stage='day_entries', data=day_entries),
         ])
@@ -103,7 +113,7 @@ class LoadHoursMatrixForSitesTests(unittest.TestCase):
                 processing_month='2026-02-01',
                 approved_only=False,
                 include_inactive=True,
-                business_id=uuid.uuid4(),
+                business_id=next_uuid(),
             )
 
         self.assertEqual(fake_session.query_calls, 5)
@@ -119,11 +129,11 @@ class LoadHoursMatrixForSitesTests(unittest.TestCase):
     def test_day_entries_bucket_by_attributed_site(self):
         """An employee managed at site Z with days attributed to X and Y appears
         in all three sites' matrices, each with only its own days."""
-        site_x, site_y, site_z = uuid.uuid4(), uuid.uuid4(), uuid.uuid4()
-        employee = SimpleNamespace(id=uuid.uuid4(), site_id=site_z, full_name='Dana', passport_id='P9')
-        work_card_id = uuid.uuid4()
+        site_x, site_y, site_z = next_uuid(), next_uuid(), next_uuid()
+        employee = _Employee(id=next_uuid(), site_id=site_z, full_name='Dana', passport_id='P9')
+        work_card_id = next_uuid()
 
-        best_cards_rows = [SimpleNamespace(
+        best_cards_rows = [_BestCard(
             work_card_id=work_card_id,
             site_id=site_z,
             employee_id=employee.id,
@@ -132,15 +142,15 @@ class LoadHoursMatrixForSitesTests(unittest.TestCase):
             monthly_total_hours=200.0,
         )]
         day_entries = [
-            SimpleNamespace(work_card_id=work_card_id, day_of_month=1, total_hours=8.0, day_status=None, attributed_site_id=site_x),
-            SimpleNamespace(work_card_id=work_card_id, day_of_month=2, total_hours=7.0, day_status=None, attributed_site_id=site_y),
-            SimpleNamespace(work_card_id=work_card_id, day_of_month=3, total_hours=6.0, day_status=None, attributed_site_id=None),
+            _DayEntry(work_card_id=work_card_id, day_of_month=1, total_hours=8.0, day_status=None, attributed_site_id=site_x),
+            _DayEntry(work_card_id=work_card_id, day_of_month=2, total_hours=7.0, day_status=None, attributed_site_id=site_y),
+            _DayEntry(work_card_id=work_card_id, day_of_month=3, total_hours=6.0, day_status=None, attributed_site_id=None),
         ]
 
         fake_session = _FakeSession([
             _FakeQuery(stage='home_employees', data=[employee]),       # home of Z
             _FakeQuery(stage='visiting_ids', data=[(employee.id,)]),   # already home → no extra query
-            _FakeQuery(stage='ranked_cards', subquery_obj=_ranked_subquery()),
+            _FakeQuery(stage='ranked_cards', subquery_obj=_RANKED_SUBQUERY),
             _FakeQuery(stage='best_cards', data=best_cards_rows),
             _FakeQuery(stage='day_entries', data=day_entries),
         ])
@@ -151,7 +161,7 @@ class LoadHoursMatrixForSitesTests(unittest.TestCase):
                 processing_month='2026-02-01',
                 approved_only=False,
                 include_inactive=True,
-                business_id=uuid.uuid4(),
+                business_id=next_uuid(),
             )
 
         self.assertEqual(fake_session.query_calls, 5)
@@ -9,7 +9,7 @@ from backend.app.services.hours_matrix_service import (
 )
 
 
-class HoursMatrixServiceTests(unittest.TestCase):
+class BuildMatrixTests(unittest.TestCase):
     def test_build_matrix_and_status_map_handles_duplicates_null_totals_and_precedence(self):
         employee_a = uuid.uuid4()
         employee_b = uuid.uuid4()
@@ -37,23 +37,43 @@ class HoursMatrixServiceTests(unittest.TestCase):
         self.assertEqual(matrix, {})
         self.assertEqual(status_map, {})
 
-    def test_build_hours_matrix_query_applies_approved_only_in_cte(self):
+
+class BuildHoursMatrixQueryTests(unittest.TestCase):
+    # The approved-only filter as it appears at the end of the ranked_cards
+    # WHERE clause; the ORDER BY CASE also mentions 'APPROVED', so match the
+    # filter in context.
+    APPROVED_FILTER = "work_cards.employee_id IS NOT NULL AND work_cards.review_status = 'APPROVED'"
+
+    @classmethod
+    def setUpClass(cls):
+        # Compile each variant once; the tests only inspect the SQL text.
         app = create_app()
         with app.app_context():
-            query = build_hours_matrix_query(
-                session=db.session,
-                business_id=uuid.uuid4(),
-                site_id=uuid.uuid4(),
-                processing_month=date(2026, 1, 1),
-                approved_only=True,
-            )
-            sql = str(query.statement.compile(compile_kwargs={'literal_binds': True}))
+            cls._sql_approved = cls._compile(approved_only=True)
+            cls._sql_any = cls._compile(approved_only=False)
 
+    @staticmethod
+    def _compile(approved_only):
+        query = build_hours_matrix_query(
+            session=db.session,
+            business_id=uuid.uuid4(),
+            site_id=uuid.uuid4(),
+            processing_month=date(2026, 1, 1),
+            approved_only=approved_only,
+        )
+        return str(query.statement.compile(compile_kwargs={'literal_binds': True}))
+
+    def test_build_hours_matrix_query_applies_approved_only_in_cte(self):
+        sql = self._sql_approved
         self.assertIn('WITH ranked_cards AS', sql)
         self.assertIn('selected_cards AS', sql)
-        self.assertIn("work_cards.review_status = 'APPROVED'", sql)
+        self.assertIn(self.APPROVED_FILTER, sql)
         self.assertIn('LEFT OUTER JOIN work_card_day_entries', sql)
 
+    def test_build_hours_matrix_query_without_approved_only_keeps_all_statuses(self):
+        self.assertIn('WITH ranked_cards AS', self._sql_any)
+        self.assertNotIn(self.APPROVED_FILTER, self._sql_any)
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,31 @@
+import os
+import unittest
+
+from alembic.script import ScriptDirectory
+
+
+MIGRATIONS_DIR = os.path.join(os.path.dirname(__file__), '..', 'migrations')
+
+
+class MigrationScriptTests(unittest.TestCase):
+    """Every migration file must register exactly one revision, and the
+    history must resolve to a single head so `db upgrade` needs no merge."""
+
+    def setUp(self):
+        self.script = ScriptDirectory(MIGRATIONS_DIR)
+        versions_dir = os.path.join(MIGRATIONS_DIR, 'versions')
+        self.migration_files = [
+            name for name in os.listdir(versions_dir)
+            if name.endswith('.py') and not name.startswith('__')
+        ]
+
+    def test_revision_ids_are_unique(self):
+        revisions = {script.revision for script in self.script.walk_revisions()}
+        self.assertEqual(len(revisions), len(self.migration_files))
+
+    def test_single_head(self):
+        self.assertEqual(len(self.script.get_heads()), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -7,14 +7,15 @@ Covers two pieces:
 The listener client is mocked everywhere — we assert wiring (window check, dedup,
 recipient resolution, image vs document, error mapping), not real WhatsApp delivery.
 """
+import os
 import unittest
 import uuid
 from datetime import date, datetime, timezone
 from unittest.mock import MagicMock, patch
 
-from dotenv import load_dotenv
+from backend.env import ensure_env
 
-load_dotenv()
+ensure_env()
 
 from backend.app import create_app, db
 from backend.app.auth_utils import encode_auth_token
@@ -34,8 +35,12 @@ NOTIFIER_CLIENT = 'backend.app.services.work_card_notifier.WhatsAppListenerClien
 
 
 class _BaseWA(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        os.environ.setdefault('JWT_SECRET_KEY', 'test-secret')
+        cls.app = create_app()
+
     def setUp(self):
-        self.app = create_app()
         self.client = self.app.test_client()
         self.ctx = self.app.app_context()
         self.ctx.push()
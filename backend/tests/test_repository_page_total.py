@@ -0,0 +1,47 @@
+import unittest
+
+from backend.app.repositories.base import BaseRepository
+
+
+class _CountingQuery:
+    def __init__(self, total):
+        self.total = total
+        self.count_calls = 0
+
+    def count(self):
+        self.count_calls += 1
+        return self.total
+
+
+class PageTotalTests(unittest.TestCase):
+    """A short page pins down the total; only full or empty out-of-range pages
+    need the COUNT(*) query."""
+
+    def test_short_first_page_skips_count(self):
+        query = _CountingQuery(total=3)
+        self.assertEqual(BaseRepository._page_total(query, 0, 20, [1, 2, 3]), 3)
+        self.assertEqual(query.count_calls, 0)
+
+    def test_empty_first_page_is_zero_without_count(self):
+        query = _CountingQuery(total=0)
+        self.assertEqual(BaseRepository._page_total(query, 0, 20, []), 0)
+        self.assertEqual(query.count_calls, 0)
+
+    def test_short_later_page_adds_offset(self):
+        query = _CountingQuery(total=45)
+        self.assertEqual(BaseRepository._page_total(query, 40, 20, [1] * 5), 45)
+        self.assertEqual(query.count_calls, 0)
+
+    def test_full_page_counts(self):
+        query = _CountingQuery(total=57)
+        self.assertEqual(BaseRepository._page_total(query, 20, 20, [1] * 20), 57)
+        self.assertEqual(query.count_calls, 1)
+
+    def test_page_past_the_end_counts(self):
+        query = _CountingQuery(total=12)
+        self.assertEqual(BaseRepository._page_total(query, 40, 20, []), 12)
+        self.assertEqual(query.count_calls, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,6 +1,7 @@
 import unittest
 import uuid
 from datetime import date
+from io import BytesIO
 from pathlib import Path
 from types import SimpleNamespace
 
@@ -15,15 +16,25 @@ from backend.app.api.sites import (
 
 
 class SalaryTemplateExportTests(unittest.TestCase):
-    def _load_template_sheet(self):
+    @classmethod
+    def setUpClass(cls):
         template_path = Path(__file__).resolve().parents[2] / 'employee_sheet_extraction' / 'worker_new_hours_template_02_2026.xlsx'
-        workbook = load_workbook(template_path)
+        cls._template_bytes = template_path.read_bytes()
+
+    def _load_template_sheet(self):
+        # Tests mutate the sheet, so each gets its own workbook, parsed from
+        # the bytes read once per class.
+        workbook = load_workbook(BytesIO(self._template_bytes))
         return workbook, workbook.worksheets[0]
 
     def test_resolve_salary_template_path_for_month(self):
         resolved = _resolve_salary_template_path(date(2026, 2, 1))
         self.assertIn('02_2026', resolved.stem)
 
+    def test_resolve_salary_template_path_is_cached_per_month(self):
+        first = _resolve_salary_template_path(date(2026, 2, 1))
+        self.assertIs(_resolve_salary_template_path(date(2026, 2, 15)), first)
+
     def test_extract_day_columns_map(self):
         _, ws = self._load_template_sheet()
         day_columns = _extract_salary_day_columns_map(ws, date(2026, 2, 1))
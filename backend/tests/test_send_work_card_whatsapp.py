@@ -4,14 +4,15 @@ Forwards a work card's stored image + an optional note to a WhatsApp group via
 the listener. The listener client is mocked — we assert the wiring (tenancy,
 missing image, note-as-caption, error mapping), not real WhatsApp delivery.
 """
+import os
 import unittest
 import uuid
 from datetime import date
 from unittest.mock import MagicMock, patch
 
-from dotenv import load_dotenv
+from backend.env import ensure_env
 
-load_dotenv()
+ensure_env()
 
 from backend.app import create_app, db
 from backend.app.auth_utils import encode_auth_token
@@ -23,16 +24,22 @@ from backend.app.services.whatsapp_listener_client import (
     WhatsAppNotConnectedError,
     WhatsAppPayloadTooLargeError,
 )
+from backend.tests.db_isolation import RollbackIsolationMixin
 
 GROUP_CHAT_ID = '123456789-987654321@g.us'
 
 
-class SendWorkCardWhatsAppTests(unittest.TestCase):
+class SendWorkCardWhatsAppTests(RollbackIsolationMixin, unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        os.environ.setdefault('JWT_SECRET_KEY', 'test-secret')
+        cls.app = create_app()
+
     def setUp(self):
-        self.app = create_app()
         self.client = self.app.test_client()
         self.ctx = self.app.app_context()
         self.ctx.push()
+        self.isolate_database()
 
         suffix = uuid.uuid4().hex[:8]
         self.business = Business(name=f'WA Biz {suffix}', code=f'wabiz-{suffix}', is_active=True)
@@ -86,19 +93,6 @@ class SendWorkCardWhatsAppTests(unittest.TestCase):
         return card
 
     def tearDown(self):
-        try:
-            for c in WorkCard.query.filter_by(business_id=self.business.id).all():
-                db.session.delete(c)
-            for e in Employee.query.filter_by(business_id=self.business.id).all():
-                db.session.delete(e)
-            for s in Site.query.filter_by(business_id=self.business.id).all():
-                db.session.delete(s)
-            for u in User.query.filter_by(business_id=self.business.id).all():
-                db.session.delete(u)
-            db.session.delete(Business.query.get(self.business.id))
-            db.session.commit()
-        except Exception:
-            db.session.rollback()
         self.ctx.pop()
 
     def _send(self, card_id, body):
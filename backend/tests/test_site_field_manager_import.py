@@ -6,13 +6,14 @@ unrecognized phone fails the whole import; an empty phone cell unassigns; a file
 without the field-manager column leaves assignments untouched; a name mismatch is
 a warning only.
 """
+import os
 import unittest
 import uuid
 from io import BytesIO
 
-from dotenv import load_dotenv
+from backend.env import ensure_env
 
-load_dotenv()
+ensure_env()
 
 from openpyxl import Workbook, load_workbook
 
@@ -21,6 +22,7 @@ from backend.app.auth_utils import encode_auth_token
 from backend.app.models.business import Business
 from backend.app.models.sites import Site
 from backend.app.models.users import User
+from backend.tests.db_isolation import RollbackIsolationMixin
 
 
 def _build_xlsx(headers, rows):
@@ -41,12 +43,17 @@ def _build_xlsx(headers, rows):
     return out.read()
 
 
-class SiteFieldManagerImportTests(unittest.TestCase):
+class SiteFieldManagerImportTests(RollbackIsolationMixin, unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        os.environ.setdefault('JWT_SECRET_KEY', 'test-secret')
+        cls.app = create_app()
+
     def setUp(self):
-        self.app = create_app()
         self.client = self.app.test_client()
         self.ctx = self.app.app_context()
         self.ctx.push()
+        self.isolate_database()
 
         suffix = uuid.uuid4().hex[:8]
         self.business = Business(name=f'FM Biz {suffix}', code=f'fmbiz-{suffix}', is_active=True)
@@ -84,15 +91,6 @@ class SiteFieldManagerImportTests(unittest.TestCase):
         self.headers = {'Authorization': f'Bearer {token}'}
 
     def tearDown(self):
-        try:
-            for s in Site.query.filter_by(business_id=self.business.id).all():
-                db.session.delete(s)
-            for u in User.query.filter_by(business_id=self.business.id).all():
-                db.session.delete(u)
-            db.session.delete(Business.query.get(self.business.id))
-            db.session.commit()
-        except Exception:
-            db.session.rollback()
         self.ctx.pop()
 
     def _preview(self, file_bytes):
@@ -9,21 +9,27 @@ from backend.app.models.sites import Employee, Site
 from backend.app.models.users import User
 from backend.app.models.work_cards import WorkCard, WorkCardDayEntry
 from backend.app.observability import QueryCounter
+from backend.tests.db_isolation import RollbackIsolationMixin
 
 
-class TestSitesQueryBudget(unittest.TestCase):
+class TestSitesQueryBudget(RollbackIsolationMixin, unittest.TestCase):
     MATRIX_QUERY_BUDGET = 12
+    UPLOAD_STATUS_QUERY_BUDGET = 5
     SUMMARY_BATCH_QUERY_BUDGET = 20
     SALARY_BATCH_QUERY_BUDGET = 20
 
-    def setUp(self):
+    @classmethod
+    def setUpClass(cls):
         os.environ.setdefault('JWT_SECRET_KEY', 'test-secret')
+        cls.app = create_app()
 
-        self.app = create_app()
+    def setUp(self):
         self.client = self.app.test_client()
         self.app_context = self.app.app_context()
         self.app_context.push()
 
+        self.isolate_database()
+
         self.business = Business(name='Perf Budget Test', code='perf-budget-test')
         db.session.add(self.business)
         db.session.flush()
@@ -87,13 +93,6 @@ class TestSitesQueryBudget(unittest.TestCase):
         self.headers = {'Authorization': f'Bearer {token}'}
 
     def tearDown(self):
-        db.session.query(WorkCardDayEntry).filter_by(work_card_id=self.work_card.id).delete()
-        db.session.query(WorkCard).filter_by(id=self.work_card.id).delete()
-        db.session.query(Employee).filter_by(id=self.employee.id).delete()
-        db.session.query(Site).filter_by(id=self.site.id).delete()
-        db.session.query(User).filter_by(id=self.user.id).delete()
-        db.session.query(Business).filter_by(id=self.business.id).delete()
-        db.session.commit()
         self.app_context.pop()
 
     def _get_with_query_count(self, path: str):
@@ -112,6 +111,18 @@ class TestSitesQueryBudget(unittest.TestCase):
             f'Matrix endpoint exceeded query budget: {query_count} > {self.MATRIX_QUERY_BUDGET}',
         )
 
+    def test_employee_upload_status_query_budget(self):
+        response, query_count = self._get_with_query_count(
+            f'/api/sites/{self.site.id}/employee-upload-status?processing_month=2026-02-01'
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.get_json()['data']), 1)
+        self.assertLessEqual(
+            query_count,
+            self.UPLOAD_STATUS_QUERY_BUDGET,
+            f'Employee upload status exceeded query budget: {query_count} > {self.UPLOAD_STATUS_QUERY_BUDGET}',
+        )
+
     def test_summary_export_batch_query_budget(self):
         response, query_count = self._get_with_query_count(
             '/api/sites/summary/export-batch?processing_month=2026-02-01'
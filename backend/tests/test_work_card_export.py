@@ -5,14 +5,15 @@ multiple per employee), embedding the review comment in the filename, and
 collision-safe naming when two selected cards share an employee.
 """
 import io
+import os
 import unittest
 import uuid
 import zipfile
 from datetime import date
 
-from dotenv import load_dotenv
+from backend.env import ensure_env
 
-load_dotenv()
+ensure_env()
 
 from backend.app import create_app, db
 from backend.app.auth_utils import encode_auth_token
@@ -20,14 +21,20 @@ from backend.app.models.business import Business
 from backend.app.models.sites import Site, Employee
 from backend.app.models.users import User
 from backend.app.models.work_cards import WorkCard, WorkCardFile
+from backend.tests.db_isolation import RollbackIsolationMixin
 
 
-class WorkCardExportTests(unittest.TestCase):
+class WorkCardExportTests(RollbackIsolationMixin, unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        os.environ.setdefault('JWT_SECRET_KEY', 'test-secret')
+        cls.app = create_app()
+
     def setUp(self):
-        self.app = create_app()
         self.client = self.app.test_client()
         self.ctx = self.app.app_context()
         self.ctx.push()
+        self.isolate_database()
 
         suffix = uuid.uuid4().hex[:8]
         self.business = Business(name=f'Exp Biz {suffix}', code=f'expbiz-{suffix}', is_active=True)
@@ -81,19 +88,6 @@ class WorkCardExportTests(unittest.TestCase):
         return card
 
     def tearDown(self):
-        try:
-            for c in WorkCard.query.filter_by(business_id=self.business.id).all():
-                db.session.delete(c)
-            for e in Employee.query.filter_by(business_id=self.business.id).all():
-                db.session.delete(e)
-            for s in Site.query.filter_by(business_id=self.business.id).all():
-                db.session.delete(s)
-            for u in User.query.filter_by(business_id=self.business.id).all():
-                db.session.delete(u)
-            db.session.delete(Business.query.get(self.business.id))
-            db.session.commit()
-        except Exception:
-            db.session.rollback()
         self.ctx.pop()
 
     def _export(self, **params):
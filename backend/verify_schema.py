@@ -1,16 +1,45 @@
 import sys
-from dotenv import load_dotenv
-load_dotenv()
+from backend.env import ensure_env
+ensure_env()
 
-from sqlalchemy import inspect
+from sqlalchemy import text
 from backend.app import create_app
 from backend.app.extensions import db
 
+# Everything the checks below need from the catalog, in one round-trip:
+# table names, employees index names, and work_card_files unique constraints
+# with their column lists.
+SCHEMA_QUERY = text("""
+    SELECT 'table' AS kind, table_name AS name, NULL::text[] AS columns
+    FROM information_schema.tables
+    WHERE table_schema = current_schema() AND table_type = 'BASE TABLE'
+    UNION ALL
+    SELECT 'index', indexname, NULL
+    FROM pg_indexes
+    WHERE schemaname = current_schema() AND tablename = 'employees'
+    UNION ALL
+    SELECT 'unique', c.conname, ARRAY(
+        SELECT a.attname::text
+        FROM unnest(c.conkey) WITH ORDINALITY AS k(attnum, ord)
+        JOIN pg_attribute a ON a.attrelid = c.conrelid AND a.attnum = k.attnum
+        ORDER BY k.ord
+    )
+    FROM pg_constraint c
+    WHERE c.contype = 'u' AND c.conrelid = to_regclass('work_card_files')
+""")
+
+EXPECTED_EMPLOYEE_INDEXES = frozenset({'ix_employees_passport_id', 'ix_employees_site_id'})
+
 def verify_schema():
     app = create_app()
     with app.app_context():
-        inspector = inspect(db.engine)
-        tables = inspector.get_table_names()
+        rows = db.session.execute(SCHEMA_QUERY).all()
+        tables = {row.name for row in rows if row.kind == 'table'}
+        index_names = {row.name for row in rows if row.kind == 'index'}
+        unique_constraints = [
+            {'name': row.name, 'column_names': row.columns} for row in rows if row.kind == 'unique'
+        ]
+        unique_column_sets = {tuple(c['column_names']) for c in unique_constraints}
         
         expected_tables = [
             'users', 'sites', 'employees', 'work_cards', 'work_card_files',
@@ -26,16 +55,14 @@ def verify_schema():
             print("OK - All tables present")
 
         # Check indexes for employees
-        indexes = inspector.get_indexes('employees')
-        index_names = [i['name'] for i in indexes]
-        if 'ix_employees_passport_id' in index_names and 'ix_employees_site_id' in index_names:
+        missing_indexes = EXPECTED_EMPLOYEE_INDEXES - index_names
+        if not missing_indexes:
              print("OK - Employee indexes present")
         else:
-             print(f"FAIL - Employee indexes missing: {index_names}")
+             print(f"FAIL - Employee indexes missing: {sorted(missing_indexes)} (found {sorted(index_names)})")
 
         # Check unique constraint on work_card_files
-        unique_constraints = inspector.get_unique_constraints('work_card_files')
-        has_unique = any(c['column_names'] == ['work_card_id'] for c in unique_constraints)
+        has_unique = ('work_card_id',) in unique_column_sets
         if has_unique:
             print("OK - work_card_files 1:1 constraint present")
         else:
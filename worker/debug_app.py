@@ -4,26 +4,44 @@ Debug extraction server — upload an image and visualize crops + extracted data
 Usage:
     python worker/debug_app.py
 """
-import base64
-from io import BytesIO
+import hashlib
+import threading
+from collections import OrderedDict
 from typing import List
 
-import cv2
-from flask import Flask, render_template, request, jsonify
+from flask import Flask, Response, abort, render_template, request, jsonify, url_for
 
 from extractor import (
-    crop_tables_from_image_bytes,
-    extract_from_image_bytes,
+    _decode_image_bytes,
+    crop_tables_from_image,
+    encode_jpeg,
+    extract_from_image,
     PIPELINE_VERSION,
 )
 
 app = Flask(__name__)
 
 
-def encode_image_array(image_array) -> str:
-    """Convert OpenCV image to base64 data URL."""
-    _, buffer = cv2.imencode(".jpg", image_array)
-    return base64.b64encode(buffer).decode("utf-8")
+# Crops are only previewed in the browser; quality 80 is a fraction of the
+# default 95's size with no visible difference at preview scale.
+DEBUG_PREVIEW_JPEG_QUALITY = 80
+
+# Crop JPEGs of the most recent uploads, keyed by a hash of the uploaded file.
+# /process returns URLs into this cache instead of inlining base64 data URIs
+# in its JSON, so the browser fetches the raw bytes as ordinary images.
+DEBUG_CROP_CACHE_SIZE = 16
+_crop_cache: "OrderedDict[str, List[bytes]]" = OrderedDict()
+_crop_cache_lock = threading.Lock()
+
+
+def _cache_crops(file_bytes: bytes, crop_jpegs: List[bytes]) -> str:
+    key = hashlib.sha1(file_bytes).hexdigest()[:12]
+    with _crop_cache_lock:
+        _crop_cache[key] = crop_jpegs
+        _crop_cache.move_to_end(key)
+        while len(_crop_cache) > DEBUG_CROP_CACHE_SIZE:
+            _crop_cache.popitem(last=False)
+    return key
 
 
 @app.route("/debug")
@@ -31,6 +49,15 @@ def debug_view():
     return render_template("extraction-debug.html")
 
 
+@app.route("/debug/crop/<key>/<int:idx>.jpg")
+def crop_image(key: str, idx: int):
+    with _crop_cache_lock:
+        crop_jpegs = _crop_cache.get(key)
+    if crop_jpegs is None or idx >= len(crop_jpegs):
+        abort(404)
+    return Response(crop_jpegs[idx], mimetype="image/jpeg")
+
+
 @app.route("/process", methods=["POST"])
 def process_image():
     if "file" not in request.files:
@@ -43,16 +70,17 @@ def process_image():
         return jsonify({"error": "Empty file"}), 400
 
     try:
-        crops = crop_tables_from_image_bytes(file_bytes)
-        crop_display_data: List[str] = []
-        for crop in crops:
-            b64_str = encode_image_array(crop)
-            crop_display_data.append(f"data:image/jpeg;base64,{b64_str}")
+        # Decode once; cropping and extraction both work on the same array.
+        img = _decode_image_bytes(file_bytes)
+        crops = crop_tables_from_image(img)
+        crop_jpegs = [encode_jpeg(crop, DEBUG_PREVIEW_JPEG_QUALITY).tobytes() for crop in crops]
+        key = _cache_crops(file_bytes, crop_jpegs)
+        crop_urls = [url_for("crop_image", key=key, idx=idx) for idx in range(len(crop_jpegs))]
 
-        extraction_result = extract_from_image_bytes(file_bytes) or {}
+        extraction_result = extract_from_image(img) or {}
 
         return jsonify({
-            "crops": crop_display_data,
+            "crops": crop_urls,
             "data": extraction_result.get("entries", []),
             "extracted_employee_name": extraction_result.get("extracted_employee_name"),
             "extracted_passport_id": extraction_result.get("extracted_passport_id"),
@@ -4,15 +4,17 @@ Image extraction module — single-pass Vision extraction with OpenCV fallback.
 Adapted from poc-worker/app.py for production use.
 """
 import base64
+import heapq
 import os
 import logging
 import re
 import time
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Optional, Dict, Any, Tuple, Iterable
 
 import cv2
 import numpy as np
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, TypeAdapter
 from openai import OpenAI, APITimeoutError, APIConnectionError
 from passport_normalization import normalize_passport
 
@@ -35,6 +37,16 @@ OPENAI_VISION_TIMEOUT_SECONDS = float(os.environ.get("OPENAI_VISION_TIMEOUT_SECO
 OPENAI_VISION_MAX_RETRIES = int(os.environ.get("OPENAI_VISION_MAX_RETRIES", "0"))
 OPENAI_VISION_MAX_DIMENSION = max(1024, int(os.environ.get("OPENAI_VISION_MAX_DIMENSION", "2200")))
 OPENAI_VISION_JPEG_QUALITY = min(95, max(50, int(os.environ.get("OPENAI_VISION_JPEG_QUALITY", "85"))))
+# Table borders only need coarse positions; detect them on a copy whose long
+# edge is at most this many pixels and crop from the full-resolution image.
+TABLE_DETECTION_MAX_DIMENSION = 1000
+# Opt-in: treat a card whose thresholded ink covers more than this fraction of
+# the frame as tightly cropped and skip contour detection (EXTRACTOR_FAST_PATH=1).
+# Provisional: calibrated only on synthetic two-table cards with the detection
+# settings below (tight crop ~0.27, same card with desk or paper margins ~0.17,
+# lightly filled crop ~0.15). Confirm against real uploads before enabling.
+EXTRACTOR_FAST_PATH = os.environ.get("EXTRACTOR_FAST_PATH", "0") == "1"
+TABLE_DETECTION_FAST_PATH_FILL = 0.22
 
 # Vision request tuning. Validated via the eval harness on real work cards:
 # detail="high" (+~4pts) and temperature=0 (deterministic transcription) both improve
@@ -63,6 +75,7 @@ OPENAI_VISION_PIPELINE = os.environ.get("OPENAI_VISION_PIPELINE", "two_phase").s
 
 # Initialize OpenAI client (uses OPENAI_API_KEY from environment)
 _client: Optional[OpenAI] = None
+_client_with_timeout: Optional[OpenAI] = None
 
 
 def get_openai_client() -> OpenAI:
@@ -75,10 +88,15 @@ def get_openai_client() -> OpenAI:
 
 def get_openai_client_with_timeout() -> OpenAI:
     """Get OpenAI client with per-request timeout override."""
-    return get_openai_client().with_options(
-        timeout=OPENAI_VISION_TIMEOUT_SECONDS,
-        max_retries=OPENAI_VISION_MAX_RETRIES,
-    )
+    global _client_with_timeout
+    if _client_with_timeout is None:
+        # with_options() builds a new client object; the settings are fixed at
+        # import time, so build it once and share the connection pool.
+        _client_with_timeout = get_openai_client().with_options(
+            timeout=OPENAI_VISION_TIMEOUT_SECONDS,
+            max_retries=OPENAI_VISION_MAX_RETRIES,
+        )
+    return _client_with_timeout
 
 
 def _dedupe_models(models: Iterable[Optional[str]]) -> List[str]:
@@ -152,6 +170,11 @@ class WorkRow(BaseModel):
     )
 
 
+# Dumps a whole entries list in one pydantic-core call instead of one
+# model_dump() per row.
+WORK_ROWS_ADAPTER = TypeAdapter(List[WorkRow])
+
+
 class WorkTable(BaseModel):
     """Collection of work entries from the card."""
     entries: List[WorkRow] = Field(default_factory=list, description="List of day entries")
@@ -232,135 +255,29 @@ class DayEntriesExtraction(BaseModel):
 # OpenCV Image Processing
 # ===========================================
 
-def _parse_exif_orientation_from_app1(payload: bytes) -> Optional[int]:
-    """Extract EXIF orientation (1-8) from a JPEG APP1 payload."""
-    if not payload.startswith(b"Exif\x00\x00"):
-        return None
-
-    tiff = payload[6:]
-    if len(tiff) < 8:
-        return None
-
-    byte_order = tiff[:2]
-    if byte_order == b"II":
-        endian = "little"
-    elif byte_order == b"MM":
-        endian = "big"
-    else:
-        return None
-
-    if int.from_bytes(tiff[2:4], endian) != 42:
-        return None
-
-    ifd0_offset = int.from_bytes(tiff[4:8], endian)
-    if ifd0_offset < 0 or ifd0_offset + 2 > len(tiff):
-        return None
-
-    entry_count = int.from_bytes(tiff[ifd0_offset:ifd0_offset + 2], endian)
-    cursor = ifd0_offset + 2
-
-    for _ in range(entry_count):
-        if cursor + 12 > len(tiff):
-            break
-
-        tag = int.from_bytes(tiff[cursor:cursor + 2], endian)
-        field_type = int.from_bytes(tiff[cursor + 2:cursor + 4], endian)
-        value_count = int.from_bytes(tiff[cursor + 4:cursor + 8], endian)
-        raw_value = tiff[cursor + 8:cursor + 12]
-        cursor += 12
-
-        if tag != 0x0112:
-            continue
-
-        orientation: Optional[int] = None
-        if field_type == 3 and value_count == 1:
-            # SHORT value packed directly into the 4-byte value field.
-            orientation = int.from_bytes(raw_value[:2], endian)
-        else:
-            value_offset = int.from_bytes(raw_value, endian)
-            if 0 <= value_offset <= len(tiff) - 2:
-                orientation = int.from_bytes(tiff[value_offset:value_offset + 2], endian)
-
-        if orientation is not None and 1 <= orientation <= 8:
-            return orientation
-        return None
-
-    return None
-
-
-def _extract_jpeg_exif_orientation(image_bytes: bytes) -> Optional[int]:
-    """Read EXIF orientation from JPEG bytes when present."""
-    if len(image_bytes) < 4 or image_bytes[:2] != b"\xFF\xD8":
-        return None
-
-    cursor = 2
-    data_length = len(image_bytes)
-
-    while cursor + 4 <= data_length:
-        # Sync to JPEG marker boundary.
-        while cursor < data_length and image_bytes[cursor] != 0xFF:
-            cursor += 1
-        if cursor + 1 >= data_length:
-            break
-
-        marker = image_bytes[cursor + 1]
-        cursor += 2
-
-        # Start of Scan / End of Image means no more APP metadata segments.
-        if marker in (0xDA, 0xD9):
-            break
-
-        if cursor + 2 > data_length:
-            break
-        segment_length = int.from_bytes(image_bytes[cursor:cursor + 2], "big")
-        if segment_length < 2 or cursor + segment_length > data_length:
-            break
-
-        if marker == 0xE1:
-            payload = image_bytes[cursor + 2:cursor + segment_length]
-            orientation = _parse_exif_orientation_from_app1(payload)
-            if orientation is not None:
-                return orientation
-
-        cursor += segment_length
-
-    return None
-
-
-def _apply_exif_orientation(image: np.ndarray, orientation: Optional[int]) -> np.ndarray:
-    if orientation is None or orientation == 1:
-        return image
-    if orientation == 2:
-        return cv2.flip(image, 1)
-    if orientation == 3:
-        return cv2.rotate(image, cv2.ROTATE_180)
-    if orientation == 4:
-        return cv2.flip(image, 0)
-    if orientation == 5:
-        return cv2.transpose(image)
-    if orientation == 6:
-        return cv2.rotate(image, cv2.ROTATE_90_CLOCKWISE)
-    if orientation == 7:
-        return cv2.flip(cv2.transpose(image), -1)
-    if orientation == 8:
-        return cv2.rotate(image, cv2.ROTATE_90_COUNTERCLOCKWISE)
-    return image
-
-
 def _decode_image_bytes(image_bytes: bytes) -> np.ndarray:
-    """Decode image bytes with EXIF orientation normalization."""
+    """Decode image bytes with EXIF orientation normalization.
+
+    cv2.imdecode applies the JPEG EXIF orientation itself for IMREAD_COLOR
+    (no IMREAD_IGNORE_ORIENTATION), so the returned image is upright.
+    """
     file_bytes = np.frombuffer(image_bytes, np.uint8)
     image = cv2.imdecode(file_bytes, cv2.IMREAD_COLOR)
     if image is None:
         raise ValueError("Could not decode image")
-
-    orientation = _extract_jpeg_exif_orientation(image_bytes)
-    if orientation and orientation != 1:
-        image = _apply_exif_orientation(image, orientation)
-        logger.debug("Applied EXIF orientation correction: %s", orientation)
     return image
 
 def crop_tables_from_image_bytes(image_bytes: bytes) -> List[np.ndarray]:
+    """
+    Decode image bytes and crop their table sections.
+
+    Raises:
+        ValueError: If image cannot be decoded
+    """
+    return crop_tables_from_image(_decode_image_bytes(image_bytes))
+
+
+def crop_tables_from_image(img: np.ndarray) -> List[np.ndarray]:
     """
     Detect and crop table sections from work card image.
     
@@ -369,22 +286,22 @@ def crop_tables_from_image_bytes(image_bytes: bytes) -> List[np.ndarray]:
     - Days 16-31 on the left side
     
     Args:
-        image_bytes: Raw image bytes (JPEG, PNG, etc.)
+        img: Decoded BGR image (see _decode_image_bytes)
         
     Returns:
         List of cropped table images as numpy arrays (sorted right-to-left)
-        
-    Raises:
-        ValueError: If image cannot be decoded
     """
-    # Decode image from bytes (with EXIF orientation normalization)
-    img = _decode_image_bytes(image_bytes)
-    
     logger.debug(f"Image size: {img.shape[1]}x{img.shape[0]}")
     
-    # 1. Convert to grayscale and blur
-    gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
-    blur = cv2.GaussianBlur(gray, (5, 5), 0)
+    # 0. Detect on a downscaled copy; boxes are mapped back before cropping
+    scale = min(1.0, TABLE_DETECTION_MAX_DIMENSION / float(max(img.shape[:2])))
+    detect_img = img
+    if scale < 1.0:
+        detect_img = cv2.resize(img, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+    
+    # 1. Convert to grayscale and box-blur (only suppresses noise before thresholding)
+    gray = cv2.cvtColor(detect_img, cv2.COLOR_BGR2GRAY)
+    blur = cv2.blur(gray, (5, 5))
     
     # 2. Adaptive threshold to find table borders
     thresh = cv2.adaptiveThreshold(
@@ -394,26 +311,35 @@ def crop_tables_from_image_bytes(image_bytes: bytes) -> List[np.ndarray]:
         11, 2
     )
     
+    if EXTRACTOR_FAST_PATH:
+        fill = cv2.countNonZero(thresh) / float(thresh.size)
+        if fill > TABLE_DETECTION_FAST_PATH_FILL:
+            logger.info("Card fills the frame (fill=%.2f), using full image", fill)
+            return [img]
+    
     # 3. Find contours
     contours, _ = cv2.findContours(thresh, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
     
     # 4. Filter to find table-sized regions (at least 5% of image area)
-    min_area = (img.shape[0] * img.shape[1]) * 0.05
+    min_area = (detect_img.shape[0] * detect_img.shape[1]) * 0.05
     potential_tables = []
     
     for cnt in contours:
         area = cv2.contourArea(cnt)
         if area > min_area:
             x, y, w, h = cv2.boundingRect(cnt)
-            potential_tables.append((x, y, w, h))
+            potential_tables.append((
+                int(x / scale), int(y / scale),
+                int(round(w / scale)), int(round(h / scale)),
+            ))
     
-    # 5. Sort tables: Right to Left (x descending)
+    # 5. Keep the two rightmost tables, right to left (x descending)
     # Days 1-15 are typically on the right, 16-31 on the left
-    potential_tables.sort(key=lambda b: b[0], reverse=True)
+    top_tables = heapq.nlargest(2, potential_tables, key=lambda b: b[0])
     
     # 6. Extract crops with padding
     crops = []
-    for (x, y, w, h) in potential_tables[:2]:  # Max 2 tables
+    for (x, y, w, h) in top_tables:
         pad = 10
         y1 = max(0, y - pad)
         y2 = min(img.shape[0], y + h + pad)
@@ -451,14 +377,21 @@ def encode_image_to_base64(image_array: np.ndarray) -> str:
             target_height,
         )
 
-    success, buffer = cv2.imencode(
-        '.jpg',
-        prepared,
-        [int(cv2.IMWRITE_JPEG_QUALITY), OPENAI_VISION_JPEG_QUALITY],
-    )
+    return encode_jpeg_b64(prepared, OPENAI_VISION_JPEG_QUALITY)
+
+
+def encode_jpeg(image_array: np.ndarray, quality: int) -> np.ndarray:
+    """JPEG-encode an OpenCV image and return the encoded buffer."""
+    success, buffer = cv2.imencode('.jpg', image_array, [int(cv2.IMWRITE_JPEG_QUALITY), quality])
     if not success:
-        raise ValueError("Could not encode image for Vision request")
-    return base64.b64encode(buffer).decode('utf-8')
+        raise ValueError("Could not encode image as JPEG")
+    return buffer
+
+
+def encode_jpeg_b64(image_array: np.ndarray, quality: int) -> str:
+    """JPEG-encode an OpenCV image and return it as a base64 string."""
+    # base64 output is pure ASCII; encoding straight from the buffer skips a copy.
+    return base64.b64encode(memoryview(encode_jpeg(image_array, quality))).decode('ascii')
 
 
 def _parse_with_model_attempts(
@@ -544,57 +477,104 @@ def _parse_with_model_attempts(
 # GPT-4o Vision Extraction
 # ===========================================
 
-def extract_single_crop(crop_img: np.ndarray) -> Optional[WorkTable]:
+CROP_EXTRACTION_SYSTEM_PROMPT = (
+    "You are a data extraction AI specialized in reading handwritten work logs. "
+    "Extract work hours from the image. For each visible row label/day, extract start time, "
+    "end time, and total hours if visible. Return times in HH:MM format (24-hour). "
+    "Day values must come from visible row labels only and must never be inferred from table "
+    "position, crop position, or expected ranges. "
+    "Return null for empty or illegible entries. "
+    "Detect OFF_MARK rows: diagonal/horizontal pen lines or crosses indicating no work; "
+    "for OFF_MARK rows return null start/end/total unless clear time digits are visible. "
+    "Never treat line-only marks as hours. "
+    "Set row_state (WORKED/OFF_MARK/EMPTY/ILLEGIBLE), mark_type (NONE/SINGLE_LINE/CROSS/HATCH), "
+    "row_confidence (0-1), and evidence tags (time_pair, total_only, off_mark_detected, unclear). "
+    "Include an optional confidence value (0-1) and optional notes for uncertain rows. "
+    "Also extract the employee name and passport/ID number if visible anywhere on the card."
+)
+
+CROP_EXTRACTION_RULES = (
+    "Only output rows where a day label is visible. "
+    "Do not infer the day from crop location or left/right placement. "
+    "If a row is marked by a strike/line with no clear digits, set OFF_MARK and null values. "
+    "Return null for empty rows."
+)
+
+
+def _crop_image_parts(base64_crops: List[str]) -> List[Dict[str, Any]]:
+    return [
+        {
+            "type": "image_url",
+            "image_url": {"url": f"data:image/jpeg;base64,{base64_crop}"}
+        }
+        for base64_crop in base64_crops
+    ]
+
+
+def extract_single_crop(crop_img: np.ndarray, base64_image: Optional[str] = None) -> Optional[WorkTable]:
     """
     Send a cropped table image to GPT-4o Vision for structured data extraction.
     
     Args:
         crop_img: Cropped table image as numpy array
+        base64_image: The crop's encode_image_to_base64 payload, if already built
     Returns:
         WorkTable with extracted entries, or None on error
     """
-    base64_image = encode_image_to_base64(crop_img)
-
+    if base64_image is None:
+        base64_image = encode_image_to_base64(crop_img)
     parsed, _ = _parse_with_model_attempts(
         request_name="Crop extraction",
         primary_model=FALLBACK_VISION_MODEL,
         fallback_model=PRIMARY_VISION_MODEL,
         messages=[
+            {"role": "system", "content": CROP_EXTRACTION_SYSTEM_PROMPT},
             {
-                "role": "system",
-                "content": (
-                    "You are a data extraction AI specialized in reading handwritten work logs. "
-                    "Extract work hours from the image. For each visible row label/day, extract start time, "
-                    "end time, and total hours if visible. Return times in HH:MM format (24-hour). "
-                    "Day values must come from visible row labels only and must never be inferred from table "
-                    "position, crop position, or expected ranges. "
-                    "Return null for empty or illegible entries. "
-                    "Detect OFF_MARK rows: diagonal/horizontal pen lines or crosses indicating no work; "
-                    "for OFF_MARK rows return null start/end/total unless clear time digits are visible. "
-                    "Never treat line-only marks as hours. "
-                    "Set row_state (WORKED/OFF_MARK/EMPTY/ILLEGIBLE), mark_type (NONE/SINGLE_LINE/CROSS/HATCH), "
-                    "row_confidence (0-1), and evidence tags (time_pair, total_only, off_mark_detected, unclear). "
-                    "Include an optional confidence value (0-1) and optional notes for uncertain rows. "
-                    "Also extract the employee name and passport/ID number if visible anywhere on the card."
-                )
-            },
+                "role": "user",
+                "content": [
+                    {
+                        "type": "text",
+                        "text": "Extract handwritten work log rows from this image. " + CROP_EXTRACTION_RULES,
+                    },
+                    *_crop_image_parts([base64_image]),
+                ]
+            }
+        ],
+        response_format=WorkTable,
+    )
+    return parsed
+
+
+def extract_crops_batch(
+    crop_images: List[np.ndarray],
+    base64_crops: Optional[List[str]] = None,
+) -> Optional[WorkTable]:
+    """
+    Send every table crop of one card in a single Vision request.
+
+    One round-trip instead of one per crop, and the model sees both halves of
+    the month together. Returns None on error, like extract_single_crop.
+    """
+    if base64_crops is None:
+        base64_crops = [encode_image_to_base64(crop_img) for crop_img in crop_images]
+    parsed, _ = _parse_with_model_attempts(
+        request_name="Batched crop extraction",
+        primary_model=FALLBACK_VISION_MODEL,
+        fallback_model=PRIMARY_VISION_MODEL,
+        messages=[
+            {"role": "system", "content": CROP_EXTRACTION_SYSTEM_PROMPT},
             {
                 "role": "user",
                 "content": [
                     {
                         "type": "text",
                         "text": (
-                            "Extract handwritten work log rows from this image. "
-                            "Only output rows where a day label is visible. "
-                            "Do not infer the day from crop location or left/right placement. "
-                            "If a row is marked by a strike/line with no clear digits, set OFF_MARK and null values. "
-                            "Return null for empty rows."
-                        )
+                            f"These {len(crop_images)} images are table sections of the same work card. "
+                            "Extract handwritten work log rows from all of them into one list. "
+                            + CROP_EXTRACTION_RULES
+                        ),
                     },
-                    {
-                        "type": "image_url",
-                        "image_url": {"url": f"data:image/jpeg;base64,{base64_image}"}
-                    }
+                    *_crop_image_parts(base64_crops),
                 ]
             }
         ],
@@ -603,7 +583,14 @@ def extract_single_crop(crop_img: np.ndarray) -> Optional[WorkTable]:
     return parsed
 
 
-TIME_PATTERN = re.compile(r"^([01]\d|2[0-3]):[0-5]\d$")
+# Every strict 24h HH:MM string; a set lookup is cheaper than a regex match in
+# the per-entry scoring/gating loops.
+VALID_TIMES = frozenset(f"{hour:02d}:{minute:02d}" for hour in range(24) for minute in range(60))
+# Separators handwritten times use in place of a colon: dot, middot, bullet,
+# fullwidth dot, semicolon.
+TIME_SEPARATOR_PATTERN = re.compile(r"[.·•．;]")
+LOOSE_TIME_PATTERN = re.compile(r"(\d{1,2}):?(\d{2})")
+HOUR_ONLY_PATTERN = re.compile(r"\d{1,2}")
 ROW_STATE_ALLOWED = {"WORKED", "OFF_MARK", "EMPTY", "ILLEGIBLE"}
 MARK_TYPE_ALLOWED = {"NONE", "SINGLE_LINE", "CROSS", "HATCH"}
 
@@ -611,7 +598,7 @@ MARK_TYPE_ALLOWED = {"NONE", "SINGLE_LINE", "CROSS", "HATCH"}
 def _is_valid_time(value: Optional[str]) -> bool:
     if value is None:
         return False
-    return bool(TIME_PATTERN.match(value.strip()))
+    return value.strip() in VALID_TIMES
 
 
 def _normalize_time_string(value: Optional[str]) -> Optional[str]:
@@ -627,11 +614,11 @@ def _normalize_time_string(value: Optional[str]) -> Optional[str]:
     if not s:
         return None
     # unify common separators (colon, dot, middot, bullet, fullwidth dot, semicolon) and drop spaces
-    candidate = re.sub(r"[.·•．;]", ":", s).replace(" ", "")
-    match = re.match(r"^(\d{1,2}):?(\d{2})$", candidate)
+    candidate = TIME_SEPARATOR_PATTERN.sub(":", s).replace(" ", "")
+    match = LOOSE_TIME_PATTERN.fullmatch(candidate)
     if match:
         hours, minutes = int(match.group(1)), int(match.group(2))
-    elif re.match(r"^\d{1,2}$", candidate):
+    elif HOUR_ONLY_PATTERN.fullmatch(candidate):
         hours, minutes = int(candidate), 0
     else:
         return s
@@ -863,17 +850,7 @@ def _apply_semantic_gating(entries: List[Dict[str, Any]]) -> Tuple[List[Dict[str
     }
 
 
-def _analyze_template_profile(image_bytes: bytes, crop_count: int) -> Dict[str, Any]:
-    try:
-        img = _decode_image_bytes(image_bytes)
-    except ValueError:
-        return {
-            "orientation": "unknown",
-            "table_sections_detected": crop_count,
-            "table_layout_confidence": None,
-            "row_density_estimate": None,
-        }
-
+def _analyze_template_profile(img: np.ndarray, crop_count: int) -> Dict[str, Any]:
     height, width = img.shape[:2]
     orientation = "landscape" if width >= height else "portrait"
     gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
@@ -930,18 +907,15 @@ def _compare_row_preference(existing: Dict[str, Any], candidate: Dict[str, Any])
 
 
 def _rerun_uncertain_days_full_image(
-    image_bytes: bytes,
+    img: np.ndarray,
     uncertain_days: List[int],
+    base64_image: Optional[str] = None,
 ) -> Optional[List[Dict[str, Any]]]:
     if not uncertain_days:
         return None
 
-    try:
-        img = _decode_image_bytes(image_bytes)
-    except ValueError:
-        return None
-
-    base64_image = encode_image_to_base64(img)
+    if base64_image is None:
+        base64_image = encode_image_to_base64(img)
     day_list = ", ".join(str(day) for day in sorted(set(uncertain_days)))
 
     parsed, _ = _parse_with_model_attempts(
@@ -984,29 +958,23 @@ def _rerun_uncertain_days_full_image(
 
     requested = set(uncertain_days)
     reviewed_entries: List[Dict[str, Any]] = []
-    for row in parsed.entries:
-        row_dict = row.model_dump()
+    for row_dict in WORK_ROWS_ADAPTER.dump_python(parsed.entries):
         day = row_dict.get("day")
         if day in requested:
             reviewed_entries.append(row_dict)
     return reviewed_entries or None
 
 
-def extract_header_from_full_image(image_bytes: bytes) -> Optional[HeaderInfo]:
+def extract_header_from_full_image(img: np.ndarray) -> Optional[HeaderInfo]:
     """
     Extract employee name and passport/ID from the full image.
 
     Args:
-        image_bytes: Raw image bytes
+        img: Decoded BGR image (see _decode_image_bytes)
 
     Returns:
         HeaderInfo with employee_name/passport_id if found, else None
     """
-    try:
-        img = _decode_image_bytes(image_bytes)
-    except ValueError as exc:
-        raise ValueError("Could not decode image for header extraction") from exc
-
     base64_image = encode_image_to_base64(img)
 
     logger.debug("Sending full image to GPT-4o for header extraction")
@@ -1124,80 +1092,87 @@ DAY_ENTRIES_USER_PROMPT = (
 )
 
 
-def _extract_identity_phase(image_bytes: bytes) -> Tuple[Optional[IdentityExtraction], Optional[str]]:
-    """Phase 1 — extract employee name and passport/ID only (one API call, full image)."""
-    try:
-        img = _decode_image_bytes(image_bytes)
-    except ValueError as exc:
-        raise ValueError("Could not decode image for identity extraction") from exc
+def _identity_messages(base64_image: str) -> List[Dict[str, Any]]:
+    return [
+        {
+            "role": "system",
+            "content": IDENTITY_SYSTEM_PROMPT,
+        },
+        {
+            "role": "user",
+            "content": [
+                {
+                    "type": "text",
+                    "text": IDENTITY_USER_PROMPT,
+                },
+                {
+                    "type": "image_url",
+                    "image_url": {"url": f"data:image/jpeg;base64,{base64_image}"},
+                },
+            ],
+        },
+    ]
 
-    base64_image = encode_image_to_base64(img)
 
+def _extract_identity_phase(base64_image: str) -> Tuple[Optional[IdentityExtraction], Optional[str]]:
+    """Phase 1 — extract employee name and passport/ID only (one API call, full image)."""
     parsed, model_used = _parse_with_model_attempts(
         request_name="Phase 1 identity extraction",
         primary_model=PRIMARY_VISION_MODEL,
         fallback_model=FALLBACK_VISION_MODEL,
-        messages=[
-            {
-                "role": "system",
-                "content": IDENTITY_SYSTEM_PROMPT,
-            },
-            {
-                "role": "user",
-                "content": [
-                    {
-                        "type": "text",
-                        "text": IDENTITY_USER_PROMPT,
-                    },
-                    {
-                        "type": "image_url",
-                        "image_url": {"url": f"data:image/jpeg;base64,{base64_image}"},
-                    },
-                ],
-            },
-        ],
+        messages=_identity_messages(base64_image),
         response_format=IdentityExtraction,
     )
     return parsed, model_used
 
 
-def _extract_day_entries_phase(image_bytes: bytes) -> Tuple[Optional[DayEntriesExtraction], Optional[str]]:
-    """Phase 2 — extract day entries only (one API call, full image)."""
-    try:
-        img = _decode_image_bytes(image_bytes)
-    except ValueError as exc:
-        raise ValueError("Could not decode image for day entries extraction") from exc
+def _day_entries_messages(base64_image: str) -> List[Dict[str, Any]]:
+    return [
+        {
+            "role": "system",
+            "content": DAY_ENTRIES_SYSTEM_PROMPT,
+        },
+        {
+            "role": "user",
+            "content": [
+                {
+                    "type": "text",
+                    "text": DAY_ENTRIES_USER_PROMPT,
+                },
+                {
+                    "type": "image_url",
+                    "image_url": {"url": f"data:image/jpeg;base64,{base64_image}"},
+                },
+            ],
+        },
+    ]
 
-    base64_image = encode_image_to_base64(img)
 
+def _extract_day_entries_phase(base64_image: str) -> Tuple[Optional[DayEntriesExtraction], Optional[str]]:
+    """Phase 2 — extract day entries only (one API call, full image)."""
     parsed, model_used = _parse_with_model_attempts(
         request_name="Phase 2 day entries extraction",
         primary_model=PRIMARY_VISION_MODEL,
         fallback_model=FALLBACK_VISION_MODEL,
-        messages=[
-            {
-                "role": "system",
-                "content": DAY_ENTRIES_SYSTEM_PROMPT,
-            },
-            {
-                "role": "user",
-                "content": [
-                    {
-                        "type": "text",
-                        "text": DAY_ENTRIES_USER_PROMPT,
-                    },
-                    {
-                        "type": "image_url",
-                        "image_url": {"url": f"data:image/jpeg;base64,{base64_image}"},
-                    },
-                ],
-            },
-        ],
+        messages=_day_entries_messages(base64_image),
         response_format=DayEntriesExtraction,
     )
     return parsed, model_used
 
 
+def _extract_crop_logged(crop_number: int, crop_img: np.ndarray, base64_image: Optional[str]) -> Optional[WorkTable]:
+    logger.info(f"Extracting data from crop {crop_number}...")
+    try:
+        result = extract_single_crop(crop_img, base64_image)
+    except Exception as e:
+        # Continue with other crops even if one fails
+        logger.error(f"Failed to extract crop {crop_number}: {e}")
+        return None
+    if result and result.entries:
+        logger.info(f"Extracted {len(result.entries)} rows from crop {crop_number}")
+    return result
+
+
 def extract_data_from_crops(crop_images: List[np.ndarray]) -> Dict[str, Any]:
     """
     Extract data from multiple cropped table images.
@@ -1212,47 +1187,57 @@ def extract_data_from_crops(crop_images: List[np.ndarray]) -> Dict[str, Any]:
     employee_name = None
     passport_id = None
     
-    for i, crop_img in enumerate(crop_images):
-        logger.info(f"Extracting data from crop {i+1}...")
-        
+    crop_results: List[Optional[WorkTable]] = []
+    # A lone crop is encoded by extract_single_crop itself.
+    base64_crops: List[Optional[str]] = [None] * len(crop_images)
+    if len(crop_images) > 1:
+        # Encoded once; the per-crop fallback resends the payloads the batch
+        # used. cv2.resize/imencode release the GIL, so crops encode side by side.
+        with ThreadPoolExecutor(max_workers=len(crop_images)) as executor:
+            base64_crops = list(executor.map(encode_image_to_base64, crop_images))
         try:
-            result = extract_single_crop(crop_img)
-            
-            if result and result.entries:
-                # Convert Pydantic objects to dicts
-                all_entries.extend([entry.model_dump() for entry in result.entries])
-                logger.info(f"Extracted {len(result.entries)} rows from crop {i+1}")
-                
-                # Capture employee info if found
-                if result.employee_name and not employee_name:
-                    employee_name = result.employee_name
-                if result.passport_id and not passport_id:
-                    passport_id = normalize_passport(result.passport_id)
-                    
+            batched = extract_crops_batch(crop_images, base64_crops)
+            if batched and batched.entries:
+                crop_results = [batched]
+                logger.info(f"Extracted {len(batched.entries)} rows from {len(crop_images)} crops in one request")
         except Exception as e:
-            logger.error(f"Failed to extract crop {i+1}: {e}")
-            # Continue with other crops even if one fails
+            logger.warning(f"Batched crop extraction failed, retrying per crop: {e}")
+    
+    if not crop_results and crop_images:
+        # Each request is seconds of server-side inference; run them side by
+        # side. map() keeps results in crop order.
+        with ThreadPoolExecutor(max_workers=len(crop_images)) as executor:
+            crop_results = list(executor.map(
+                _extract_crop_logged, range(1, len(crop_images) + 1), crop_images, base64_crops,
+            ))
+    
+    for result in crop_results:
+        if result and result.entries:
+            # Convert Pydantic objects to dicts
+            all_entries.extend(WORK_ROWS_ADAPTER.dump_python(result.entries))
+            
+            # Capture employee info if found
+            if result.employee_name and not employee_name:
+                employee_name = result.employee_name
+            if result.passport_id and not passport_id:
+                passport_id = normalize_passport(result.passport_id)
     
     # Sort entries by day and deduplicate
     if all_entries:
-        # Keep best duplicate per day by confidence + field validity.
-        best_by_day: Dict[int, Dict[str, Any]] = {}
+        # Keep best duplicate per day by confidence + field validity. Each
+        # entry is scored once; the kept entry's score rides along with it.
+        best_by_day: Dict[int, Tuple[float, Dict[str, Any]]] = {}
         for entry in all_entries:
             day = entry.get('day')
             if day is None:
                 continue
 
+            score = _entry_quality_score(entry)
             existing = best_by_day.get(day)
-            if not existing:
-                best_by_day[day] = entry
-                continue
-
-            current_score = _entry_quality_score(entry)
-            existing_score = _entry_quality_score(existing)
-            if current_score > existing_score:
-                best_by_day[day] = entry
+            if existing is None or score > existing[0]:
+                best_by_day[day] = (score, entry)
 
-        all_entries = [best_by_day[day] for day in sorted(best_by_day.keys())]
+        all_entries = [best_by_day[day][1] for day in sorted(best_by_day)]
     
     logger.info(f"Total extracted: {len(all_entries)} unique day entries")
     
@@ -1263,14 +1248,9 @@ def extract_data_from_crops(crop_images: List[np.ndarray]) -> Dict[str, Any]:
     }
 
 
-def extract_full_image_single_pass(image_bytes: bytes) -> Tuple[Optional[SinglePassExtraction], Optional[str]]:
+def extract_full_image_single_pass(img: np.ndarray) -> Tuple[Optional[SinglePassExtraction], Optional[str]]:
     """Send full image once to a stronger vision model for unified extraction."""
 
-    try:
-        img = _decode_image_bytes(image_bytes)
-    except ValueError as exc:
-        raise ValueError("Could not decode image for extraction") from exc
-
     base64_image = encode_image_to_base64(img)
 
     parsed, model_used = _parse_with_model_attempts(
@@ -1323,8 +1303,8 @@ def extract_full_image_single_pass(image_bytes: bytes) -> Tuple[Optional[SingleP
 
 def _build_result_from_single_pass(single_pass: SinglePassExtraction) -> Dict[str, Any]:
     best_by_day: Dict[int, Dict[str, Any]] = {}
-    for entry in single_pass.entries:
-        entry_dict = _normalize_entry_payload(entry.model_dump())
+    for entry in WORK_ROWS_ADAPTER.dump_python(single_pass.entries):
+        entry_dict = _normalize_entry_payload(entry)
         day = entry_dict.get("day")
         if not isinstance(day, int) or day < 1 or day > 31:
             continue
@@ -1391,8 +1371,8 @@ def _build_result_from_phases(
 ) -> Dict[str, Any]:
     """Combine Phase 1 (identity) + Phase 2 (day entries) into the same dict shape as _build_result_from_single_pass."""
     best_by_day: Dict[int, Dict[str, Any]] = {}
-    for entry in day_entries.entries:
-        entry_dict = _normalize_entry_payload(entry.model_dump())
+    for entry in WORK_ROWS_ADAPTER.dump_python(day_entries.entries):
+        entry_dict = _normalize_entry_payload(entry)
         day = entry_dict.get("day")
         if not isinstance(day, int) or day < 1 or day > 31:
             continue
@@ -1442,18 +1422,21 @@ def _finalize_extraction_result(
     raw_result: Dict[str, Any],
     semantic_quality: Dict[str, Any],
     fallback_used: bool,
-    image_bytes: bytes,
+    img: np.ndarray,
     model_name: Optional[str],
+    base64_image: Optional[str] = None,
 ) -> Dict[str, Any]:
     """Shared tail for all pipelines: optional row re-read, template profile,
-    raw_result assembly, and the final return shape."""
+    raw_result assembly, and the final return shape. base64_image, when
+    given, is the already-encoded full image the re-read resends."""
     # --- Optional: targeted re-read for uncertain rows ---
     if ENABLE_ROW_REREAD and semantic_quality["review_required_days"]:
         requested_days = list(semantic_quality["review_required_days"])
         try:
             reread_entries = _rerun_uncertain_days_full_image(
-                image_bytes=image_bytes,
+                img=img,
                 uncertain_days=requested_days,
+                base64_image=base64_image,
             )
             if reread_entries:
                 merged_by_day: Dict[int, Dict[str, Any]] = {
@@ -1482,9 +1465,9 @@ def _finalize_extraction_result(
             logger.warning("Targeted row reread failed: %s", reread_error)
             raw_result["targeted_reread"] = {"enabled": True, "error": str(reread_error)}
 
-    crops_for_profile = crop_tables_from_image_bytes(image_bytes)
+    crops_for_profile = crop_tables_from_image(img)
     template_profile = _analyze_template_profile(
-        image_bytes=image_bytes,
+        img=img,
         crop_count=len(crops_for_profile),
     )
     result["template_profile"] = template_profile
@@ -1501,7 +1484,7 @@ def _finalize_extraction_result(
     return result
 
 
-def _extract_single_pass(image_bytes: bytes) -> Dict[str, Any]:
+def _extract_single_pass(img: np.ndarray) -> Dict[str, Any]:
     """Single-pass pipeline: one combined vision call (identity + day entries),
     with OpenCV crop fallback. Mirrors the pre-2.0 architecture for A/B testing."""
     fallback_used = False
@@ -1510,7 +1493,7 @@ def _extract_single_pass(image_bytes: bytes) -> Dict[str, Any]:
     single_pass: Optional[SinglePassExtraction] = None
     sp_model: Optional[str] = None
     try:
-        single_pass, sp_model = extract_full_image_single_pass(image_bytes)
+        single_pass, sp_model = extract_full_image_single_pass(img)
         if single_pass is None:
             raise ValueError("Single-pass extraction returned no result")
     except Exception as sp_err:
@@ -1532,7 +1515,7 @@ def _extract_single_pass(image_bytes: bytes) -> Dict[str, Any]:
 
     if single_pass is None:
         fallback_used = True
-        crops = crop_tables_from_image_bytes(image_bytes)
+        crops = crop_tables_from_image(img)
         fallback_result = extract_data_from_crops(crops)
         fallback_result['selected_passport_id_normalized'] = normalize_passport(
             fallback_result.get('extracted_passport_id')
@@ -1549,27 +1532,134 @@ def _extract_single_pass(image_bytes: bytes) -> Dict[str, Any]:
         raw_result=raw_result,
         semantic_quality=semantic_quality,
         fallback_used=fallback_used,
-        image_bytes=image_bytes,
+        img=img,
         model_name=sp_model,
     )
 
 
+def _build_phased_result(
+    img: np.ndarray,
+    phase1_identity: IdentityExtraction,
+    phase1_model: Optional[str],
+    phase2_entries: Optional[DayEntriesExtraction],
+    phase2_model: Optional[str],
+    base64_image: Optional[str] = None,
+) -> Dict[str, Any]:
+    """Assemble the two-phase result: validation, OpenCV crop fallback,
+    optional Phase 3 re-read and raw_result metadata. base64_image is the
+    payload Phases 1/2 sent, reused by the re-read when given."""
+    fallback_used = False
+    semantic_quality = {
+        "review_required_days": [],
+        "off_mark_days": [],
+        "row_quality_by_day": {},
+    }
+
+    raw_result: Dict[str, Any] = {
+        "strategy": "three_phase_pipeline",
+        "phase1_identity": phase1_identity.model_dump() if phase1_identity else None,
+        "phase1_model": phase1_model,
+        "phase2_entries": phase2_entries.model_dump() if phase2_entries else None,
+        "phase2_model": phase2_model,
+    }
+
+    if phase2_entries is not None:
+        result = _build_result_from_phases(phase1_identity, phase2_entries)
+        result["entries"], semantic_quality = _apply_semantic_gating(result.get("entries", []))
+
+        if not _phased_result_is_valid(result):
+            logger.warning("Phase 2 result failed validation; falling back to OpenCV crops")
+            phase2_entries = None  # trigger fallback below
+
+    if phase2_entries is None:
+        fallback_used = True
+        logger.info("Using OpenCV fallback for day entries (Phase 1 identity reused)")
+
+        crops = crop_tables_from_image(img)
+        fallback_result = extract_data_from_crops(crops)
+
+        # Reuse Phase 1 identity — no redundant header API call
+        if phase1_identity.employee_name:
+            fallback_result['extracted_employee_name'] = phase1_identity.employee_name
+        if phase1_identity.selected_passport_id_normalized or phase1_identity.passport_id_candidates:
+            normalized_from_candidates = [
+                normalize_passport(c.normalized or c.raw)
+                for c in phase1_identity.passport_id_candidates
+                if c.raw
+            ]
+            normalized_from_candidates = [v for v in normalized_from_candidates if v]
+            selected = normalize_passport(phase1_identity.selected_passport_id_normalized)
+            if not selected and normalized_from_candidates:
+                selected = normalized_from_candidates[0]
+            if selected:
+                fallback_result['extracted_passport_id'] = selected
+
+        fallback_result['selected_passport_id_normalized'] = normalize_passport(
+            fallback_result.get('extracted_passport_id')
+        )
+        candidate_list = [
+            {
+                "raw": c.raw,
+                "normalized": normalize_passport(c.normalized or c.raw),
+                "source_region": c.source_region,
+                "confidence": c.confidence,
+            }
+            for c in phase1_identity.passport_id_candidates
+        ]
+        normalized_candidates = [
+            c["normalized"] for c in candidate_list if c["normalized"]
+        ]
+        fallback_result['passport_id_candidates'] = candidate_list
+        fallback_result['normalized_passport_candidates'] = normalized_candidates
+        fallback_result["entries"], semantic_quality = _apply_semantic_gating(fallback_result.get("entries", []))
+        result = fallback_result
+        raw_result["fallback"] = {
+            "num_crops": len(crops),
+            "entries": result.get("entries", []),
+        }
+        raw_result["strategy"] = "opencv_fallback"
+
+    return _finalize_extraction_result(
+        result=result,
+        raw_result=raw_result,
+        semantic_quality=semantic_quality,
+        fallback_used=fallback_used,
+        img=img,
+        model_name=phase2_model or phase1_model,
+        base64_image=base64_image,
+    )
+
+
 # ===========================================
 # Main Entry Point
 # ===========================================
 
 def extract_from_image_bytes(image_bytes: bytes) -> Optional[Dict[str, Any]]:
     """
-    Main extraction function — processes image bytes through the 3-phase pipeline.
+    Decode image bytes once and run them through extract_from_image.
+
+    Returns None when the bytes cannot be decoded.
+    """
+    try:
+        img = _decode_image_bytes(image_bytes)
+    except ValueError as e:
+        logger.error(f"Image processing error: {e}")
+        return None
+    return extract_from_image(img)
+
+
+def extract_from_image(img: np.ndarray) -> Optional[Dict[str, Any]]:
+    """
+    Main extraction function — processes a decoded image through the 3-phase pipeline.
 
     Pipeline:
     1. Phase 1: Identity extraction (name + passport) — 1 API call
-    2. Phase 2: Day entries extraction — 1 API call
+    2. Phase 2: Day entries extraction — 1 API call, sent alongside Phase 1
     3. If Phase 2 fails validation → OpenCV fallback (reuses Phase 1 identity)
     4. Phase 3 (optional): Targeted re-read for uncertain rows — 0-1 API calls
 
     Args:
-        image_bytes: Raw image bytes
+        img: Decoded BGR image (see _decode_image_bytes); every phase reuses it
 
     Returns:
         Dict containing:
@@ -1584,160 +1674,41 @@ def extract_from_image_bytes(image_bytes: bytes) -> Optional[Dict[str, Any]]:
     """
     try:
         if OPENAI_VISION_PIPELINE == "single_pass":
-            return _extract_single_pass(image_bytes)
-
-        fallback_used = False
-        semantic_quality = {
-            "review_required_days": [],
-            "off_mark_days": [],
-            "row_quality_by_day": {},
-        }
-
-        # --- Phase 1: Identity ---
-        logger.info("Starting Phase 1: identity extraction...")
-        phase1_identity: Optional[IdentityExtraction] = None
-        phase1_model: Optional[str] = None
-        try:
-            phase1_identity, phase1_model = _extract_identity_phase(image_bytes)
-            if phase1_identity is None:
-                logger.warning("Phase 1 identity extraction returned no result; using empty identity")
+            return _extract_single_pass(img)
+
+        # Phases 1 and 2 each send the full image and neither needs the
+        # other's answer, so both requests are in flight at once.
+        logger.info("Starting Phase 1 (identity) and Phase 2 (day entries) extraction...")
+        # Resize + JPEG + base64 once; both phases (and the re-read) send the same payload.
+        base64_image = encode_image_to_base64(img)
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            phase1_future = executor.submit(_extract_identity_phase, base64_image)
+            phase2_future = executor.submit(_extract_day_entries_phase, base64_image)
+
+            # --- Phase 1: Identity ---
+            phase1_identity: Optional[IdentityExtraction] = None
+            phase1_model: Optional[str] = None
+            try:
+                phase1_identity, phase1_model = phase1_future.result()
+                if phase1_identity is None:
+                    logger.warning("Phase 1 identity extraction returned no result; using empty identity")
+                    phase1_identity = IdentityExtraction()
+            except Exception as phase1_err:
+                logger.warning("Phase 1 identity extraction failed (non-fatal): %s", phase1_err)
                 phase1_identity = IdentityExtraction()
-        except Exception as phase1_err:
-            logger.warning("Phase 1 identity extraction failed (non-fatal): %s", phase1_err)
-            phase1_identity = IdentityExtraction()
-
-        # --- Phase 2: Day entries ---
-        logger.info("Starting Phase 2: day entries extraction...")
-        phase2_entries: Optional[DayEntriesExtraction] = None
-        phase2_model: Optional[str] = None
-        try:
-            phase2_entries, phase2_model = _extract_day_entries_phase(image_bytes)
-            if phase2_entries is None:
-                raise ValueError("Phase 2 day entries extraction returned no result")
-        except Exception as phase2_err:
-            logger.warning("Phase 2 day entries extraction failed: %s", phase2_err)
-            phase2_entries = None
-
-        raw_result: Dict[str, Any] = {
-            "strategy": "three_phase_pipeline",
-            "phase1_identity": phase1_identity.model_dump() if phase1_identity else None,
-            "phase1_model": phase1_model,
-            "phase2_entries": phase2_entries.model_dump() if phase2_entries else None,
-            "phase2_model": phase2_model,
-        }
 
-        if phase2_entries is not None:
-            result = _build_result_from_phases(phase1_identity, phase2_entries)
-            result["entries"], semantic_quality = _apply_semantic_gating(result.get("entries", []))
-
-            if not _phased_result_is_valid(result):
-                logger.warning("Phase 2 result failed validation; falling back to OpenCV crops")
-                phase2_entries = None  # trigger fallback below
-
-        if phase2_entries is None:
-            fallback_used = True
-            logger.info("Using OpenCV fallback for day entries (Phase 1 identity reused)")
-
-            crops = crop_tables_from_image_bytes(image_bytes)
-            fallback_result = extract_data_from_crops(crops)
-
-            # Reuse Phase 1 identity — no redundant header API call
-            if phase1_identity.employee_name:
-                fallback_result['extracted_employee_name'] = phase1_identity.employee_name
-            if phase1_identity.selected_passport_id_normalized or phase1_identity.passport_id_candidates:
-                normalized_from_candidates = [
-                    normalize_passport(c.normalized or c.raw)
-                    for c in phase1_identity.passport_id_candidates
-                    if c.raw
-                ]
-                normalized_from_candidates = [v for v in normalized_from_candidates if v]
-                selected = normalize_passport(phase1_identity.selected_passport_id_normalized)
-                if not selected and normalized_from_candidates:
-                    selected = normalized_from_candidates[0]
-                if selected:
-                    fallback_result['extracted_passport_id'] = selected
-
-            fallback_result['selected_passport_id_normalized'] = normalize_passport(
-                fallback_result.get('extracted_passport_id')
-            )
-            candidate_list = [
-                {
-                    "raw": c.raw,
-                    "normalized": normalize_passport(c.normalized or c.raw),
-                    "source_region": c.source_region,
-                    "confidence": c.confidence,
-                }
-                for c in phase1_identity.passport_id_candidates
-            ]
-            normalized_candidates = [
-                c["normalized"] for c in candidate_list if c["normalized"]
-            ]
-            fallback_result['passport_id_candidates'] = candidate_list
-            fallback_result['normalized_passport_candidates'] = normalized_candidates
-            fallback_result["entries"], semantic_quality = _apply_semantic_gating(fallback_result.get("entries", []))
-            result = fallback_result
-            raw_result["fallback"] = {
-                "num_crops": len(crops),
-                "entries": result.get("entries", []),
-            }
-            raw_result["strategy"] = "opencv_fallback"
-
-        # --- Phase 3 (optional): Targeted re-read for uncertain rows ---
-        if ENABLE_ROW_REREAD and semantic_quality["review_required_days"]:
-            requested_days = list(semantic_quality["review_required_days"])
+            # --- Phase 2: Day entries ---
+            phase2_entries: Optional[DayEntriesExtraction] = None
+            phase2_model: Optional[str] = None
             try:
-                reread_entries = _rerun_uncertain_days_full_image(
-                    image_bytes=image_bytes,
-                    uncertain_days=requested_days,
-                )
-                if reread_entries:
-                    merged_by_day: Dict[int, Dict[str, Any]] = {
-                        int(entry["day"]): _normalize_entry_payload(entry)
-                        for entry in result.get("entries", [])
-                        if isinstance(entry.get("day"), int)
-                    }
-                    for reread_entry in reread_entries:
-                        day = reread_entry.get("day")
-                        if not isinstance(day, int):
-                            continue
-                        candidate = _normalize_entry_payload(reread_entry)
-                        existing = merged_by_day.get(day)
-                        if not existing or _compare_row_preference(existing, candidate):
-                            merged_by_day[day] = candidate
-                    result["entries"] = [merged_by_day[day] for day in sorted(merged_by_day.keys())]
-                    result["entries"], semantic_quality = _apply_semantic_gating(result.get("entries", []))
-                    raw_result["targeted_reread"] = {
-                        "enabled": True,
-                        "requested_days": requested_days,
-                        "applied_days": sorted(
-                            day for day in (entry.get("day") for entry in reread_entries) if isinstance(day, int)
-                        ),
-                    }
-            except Exception as reread_error:
-                logger.warning("Targeted row reread failed: %s", reread_error)
-                raw_result["targeted_reread"] = {
-                    "enabled": True,
-                    "error": str(reread_error),
-                }
-
-        crops_for_profile = crop_tables_from_image_bytes(image_bytes)
-        template_profile = _analyze_template_profile(
-            image_bytes=image_bytes,
-            crop_count=len(crops_for_profile),
-        )
-        result["template_profile"] = template_profile
-        result["row_quality"] = semantic_quality
-
-        result['raw_result'] = raw_result
-        result['raw_result']['selected_passport_id_normalized'] = result.get('selected_passport_id_normalized')
-        result['raw_result']['passport_id_candidates'] = result.get('passport_id_candidates', [])
-        result['raw_result']['normalized_passport_candidates'] = result.get('normalized_passport_candidates', [])
-        result['raw_result']['row_quality'] = result.get('row_quality')
-        result['raw_result']['template_profile'] = result.get('template_profile')
-        result['model_name'] = phase2_model or phase1_model or PRIMARY_VISION_MODEL
-        result['fallback_used'] = fallback_used
-
-        return result
+                phase2_entries, phase2_model = phase2_future.result()
+                if phase2_entries is None:
+                    raise ValueError("Phase 2 day entries extraction returned no result")
+            except Exception as phase2_err:
+                logger.warning("Phase 2 day entries extraction failed: %s", phase2_err)
+                phase2_entries = None
+
+        return _build_phased_result(img, phase1_identity, phase1_model, phase2_entries, phase2_model, base64_image)
 
     except ValueError as e:
         logger.error(f"Image processing error: {e}")
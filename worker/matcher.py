@@ -30,6 +30,8 @@ OCR_CONFUSION_SUBSTITUTION_COST = {
     frozenset(("B", "8")): 0.5,
 }
 
+NON_ALNUM_PATTERN = re.compile(r"[^a-z0-9]+")
+
 
 def _coerce_passport_candidate_values(passport_candidates: Optional[Iterable[Any]]) -> List[str]:
     coerced: List[str] = []
@@ -98,7 +100,7 @@ def _name_normalize(value: Optional[str]) -> str:
     cleaned = unicodedata.normalize("NFKD", value)
     cleaned = "".join(ch for ch in cleaned if not unicodedata.combining(ch))
     cleaned = cleaned.lower()
-    cleaned = re.sub(r"[^a-z0-9]+", "", cleaned)
+    cleaned = NON_ALNUM_PATTERN.sub("", cleaned)
     return cleaned
 
 
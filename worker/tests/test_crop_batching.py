@@ -0,0 +1,69 @@
+import itertools
+import sys
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import extractor
+from extractor import WorkRow, WorkTable, extract_data_from_crops
+
+
+CROPS = [np.zeros((40, 30, 3), np.uint8), np.zeros((40, 30, 3), np.uint8)]
+
+
+def _image_count(messages):
+    return sum(1 for block in messages[1]["content"] if block["type"] == "image_url")
+
+
+def test_two_crops_are_sent_in_one_request(monkeypatch):
+    calls = []
+
+    def fake_parse(**kwargs):
+        calls.append((kwargs["request_name"], _image_count(kwargs["messages"])))
+        return WorkTable(entries=[WorkRow(day=3), WorkRow(day=18)]), "model"
+
+    monkeypatch.setattr(extractor, "_parse_with_model_attempts", fake_parse)
+
+    result = extract_data_from_crops(CROPS)
+
+    assert calls == [("Batched crop extraction", 2)]
+    assert [entry["day"] for entry in result["entries"]] == [3, 18]
+
+
+def test_failed_batch_falls_back_to_per_crop_requests(monkeypatch):
+    calls = []
+    # Per-crop requests run on a thread pool; next() on a count is atomic.
+    days = itertools.count(2)
+
+    def fake_parse(**kwargs):
+        calls.append((kwargs["request_name"], _image_count(kwargs["messages"])))
+        if kwargs["request_name"] == "Batched crop extraction":
+            return None, None
+        return WorkTable(entries=[WorkRow(day=next(days))]), "model"
+
+    monkeypatch.setattr(extractor, "_parse_with_model_attempts", fake_parse)
+
+    result = extract_data_from_crops(CROPS)
+
+    assert calls == [
+        ("Batched crop extraction", 2),
+        ("Crop extraction", 1),
+        ("Crop extraction", 1),
+    ]
+    assert [entry["day"] for entry in result["entries"]] == [2, 3]
+
+
+def test_single_crop_skips_the_batch_request(monkeypatch):
+    calls = []
+
+    def fake_parse(**kwargs):
+        calls.append(kwargs["request_name"])
+        return WorkTable(entries=[WorkRow(day=1)]), "model"
+
+    monkeypatch.setattr(extractor, "_parse_with_model_attempts", fake_parse)
+
+    extract_data_from_crops(CROPS[:1])
+
+    assert calls == ["Crop extraction"]
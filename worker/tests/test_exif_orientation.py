@@ -1,15 +1,16 @@
 import sys
 from pathlib import Path
 
+import cv2
 import numpy as np
 
 sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
 
-from extractor import _apply_exif_orientation, _extract_jpeg_exif_orientation
+from extractor import _decode_image_bytes
 
 
-def _build_exif_jpeg_bytes(orientation: int) -> bytes:
-    # Minimal JPEG with one APP1 EXIF segment containing orientation tag (0x0112).
+def _build_exif_app1(orientation: int) -> bytes:
+    # APP1 EXIF segment containing only the orientation tag (0x0112).
     tiff_header = b"MM" + (42).to_bytes(2, "big") + (8).to_bytes(4, "big")
     ifd_entry_count = (1).to_bytes(2, "big")
     orientation_entry = (
@@ -21,24 +22,31 @@ def _build_exif_jpeg_bytes(orientation: int) -> bytes:
     )
     next_ifd = (0).to_bytes(4, "big")
     exif_payload = b"Exif\x00\x00" + tiff_header + ifd_entry_count + orientation_entry + next_ifd
-    app1 = b"\xFF\xE1" + (len(exif_payload) + 2).to_bytes(2, "big") + exif_payload
-    return b"\xFF\xD8" + app1 + b"\xFF\xD9"
+    return b"\xFF\xE1" + (len(exif_payload) + 2).to_bytes(2, "big") + exif_payload
 
 
-def test_extracts_jpeg_exif_orientation():
-    jpeg = _build_exif_jpeg_bytes(8)
-    assert _extract_jpeg_exif_orientation(jpeg) == 8
+def _landscape_jpeg_with_orientation(orientation: int) -> bytes:
+    # 40x20 landscape image whose left half is white.
+    image = np.zeros((20, 40, 3), dtype=np.uint8)
+    image[:, :20] = 255
+    _, buffer = cv2.imencode(".jpg", image)
+    jpeg = buffer.tobytes()
+    return jpeg[:2] + _build_exif_app1(orientation) + jpeg[2:]
 
 
-def test_apply_exif_orientation_rotates_90_clockwise_for_value_6():
-    source = np.array([[0, 1, 2], [3, 4, 5]], dtype=np.uint8)
-    rotated = _apply_exif_orientation(source, 6)
-    expected = np.array([[3, 0], [4, 1], [5, 2]], dtype=np.uint8)
-    assert np.array_equal(rotated, expected)
+def test_decode_rotates_90_clockwise_for_orientation_6():
+    decoded = _decode_image_bytes(_landscape_jpeg_with_orientation(6))
+    assert decoded.shape[:2] == (40, 20)
+    # The white left half ends up on top.
+    assert decoded[:20].mean() > 200 and decoded[20:].mean() < 50
 
 
-def test_apply_exif_orientation_rotates_90_counterclockwise_for_value_8():
-    source = np.array([[0, 1, 2], [3, 4, 5]], dtype=np.uint8)
-    rotated = _apply_exif_orientation(source, 8)
-    expected = np.array([[2, 5], [1, 4], [0, 3]], dtype=np.uint8)
-    assert np.array_equal(rotated, expected)
+def test_decode_rotates_90_counterclockwise_for_orientation_8():
+    decoded = _decode_image_bytes(_landscape_jpeg_with_orientation(8))
+    assert decoded.shape[:2] == (40, 20)
+    assert decoded[20:].mean() > 200 and decoded[:20].mean() < 50
+
+
+def test_decode_leaves_orientation_1_untouched():
+    decoded = _decode_image_bytes(_landscape_jpeg_with_orientation(1))
+    assert decoded.shape[:2] == (20, 40)
@@ -0,0 +1,39 @@
+import sys
+import threading
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import extractor
+from extractor import IdentityExtraction, extract_from_image
+
+
+def test_identity_and_day_entry_phases_run_concurrently(monkeypatch):
+    # Each phase waits for the other; run one after the other they would time out.
+    both_in_flight = threading.Barrier(2, timeout=5)
+
+    def fake_identity(base64_image):
+        both_in_flight.wait()
+        return IdentityExtraction(employee_name="Dana"), "model"
+
+    def fake_day_entries(base64_image):
+        both_in_flight.wait()
+        return None, None
+
+    def fake_crop_fallback(crops):
+        return {"entries": [], "extracted_employee_name": None, "extracted_passport_id": None}
+
+    monkeypatch.setattr(extractor, "OPENAI_VISION_PIPELINE", "two_phase")
+    # Phase 2 returning nothing sends the result down the crop fallback; stub it
+    # (and the re-read) so the test never reaches a real vision call.
+    monkeypatch.setattr(extractor, "extract_data_from_crops", fake_crop_fallback)
+    monkeypatch.setattr(extractor, "ENABLE_ROW_REREAD", False)
+    monkeypatch.setattr(extractor, "_extract_identity_phase", fake_identity)
+    monkeypatch.setattr(extractor, "_extract_day_entries_phase", fake_day_entries)
+
+    result = extract_from_image(np.zeros((200, 150, 3), np.uint8))
+
+    assert result["extracted_employee_name"] == "Dana"
+    assert result["fallback_used"] is True